@@ -0,0 +1,190 @@
+"""Unit tests for the fingerprint module."""
+from unittest.mock import patch
+
+import numpy as np
+
+from transcribe_me.audio import transcription
+from transcribe_me.audio.fingerprint import (
+    SAMPLE_RATE,
+    HOP_SIZE,
+    FingerprintIndex,
+    bit_error_rate,
+    fingerprint_samples,
+)
+
+
+def _recording(seed: int, seconds: int = 60) -> np.ndarray:
+    """Generate a deterministic noise-like recording with speech-band modulation."""
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal(seconds * SAMPLE_RATE)
+    envelope = np.repeat(rng.random(seconds * 10), SAMPLE_RATE // 10)
+    return (noise * envelope * 8000).astype(np.float32)
+
+
+def test_fingerprint_samples_shape():
+    """Test that one 32-bit sub-fingerprint is produced per hop."""
+    fingerprint = fingerprint_samples(_recording(1, seconds=10))
+
+    assert fingerprint.dtype == np.uint32
+    assert abs(len(fingerprint) - 10 * SAMPLE_RATE / HOP_SIZE) < 10
+
+
+def test_fingerprint_samples_too_short():
+    """Test that audio shorter than a frame produces an empty fingerprint."""
+    assert len(fingerprint_samples(np.zeros(100))) == 0
+
+
+def test_fingerprint_survives_gain_and_noise():
+    """Test that a louder, slightly noisy copy keeps a low bit error rate."""
+    original = _recording(2)
+    rng = np.random.default_rng(3)
+    copy = original * 1.7 + rng.standard_normal(len(original)) * 200
+
+    assert bit_error_rate(fingerprint_samples(original), fingerprint_samples(copy)) < 0.2
+
+
+def test_index_finds_shifted_duplicate(tmp_path):
+    """Test that a copy starting at a different time is found with full coverage."""
+    original = _recording(4)
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint_samples(original))
+    index.add("b.mp3", "b.txt", fingerprint_samples(_recording(5)))
+
+    copy = original[2 * SAMPLE_RATE:]
+    match = index.lookup(fingerprint_samples(copy))
+    index.close()
+
+    assert match is not None
+    assert match.source_path == "a.mp3"
+    assert match.transcript_path == "a.txt"
+    assert match.coverage > 0.95
+    assert abs(match.offset_seconds - 2) < 0.1
+
+
+def test_index_reports_partial_overlap(tmp_path):
+    """Test that a recording sharing only part of its audio has partial coverage."""
+    original = _recording(6)
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint_samples(original))
+
+    overlapping = np.concatenate([original[30 * SAMPLE_RATE:], _recording(7, seconds=30)])
+    match = index.lookup(fingerprint_samples(overlapping))
+    index.close()
+
+    assert match is not None
+    assert 0.4 < match.coverage < 0.6
+
+
+def test_index_reports_excerpt_as_partial(tmp_path):
+    """Test that an excerpt of a longer recording is not reported as a full copy."""
+    original = _recording(11, seconds=120)
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("meeting.mp3", "meeting.txt", fingerprint_samples(original))
+
+    match = index.lookup(fingerprint_samples(original[30 * SAMPLE_RATE: 60 * SAMPLE_RATE]))
+    index.close()
+
+    assert match is not None
+    assert match.source_path == "meeting.mp3"
+    assert 0.2 < match.coverage < 0.3
+
+
+def test_silent_frames_are_not_fingerprinted():
+    """Test that silence produces only SILENT sub-fingerprints."""
+    rng = np.random.default_rng(12)
+    quiet = rng.standard_normal(10 * SAMPLE_RATE) * 5
+
+    assert not fingerprint_samples(np.zeros(10 * SAMPLE_RATE)).any()
+    assert not fingerprint_samples(quiet).any()
+
+
+def test_index_ignores_recordings_that_are_mostly_silence(tmp_path):
+    """Test that two different, mostly silent recordings do not match through their silence."""
+
+    def mostly_silent(seed: int) -> np.ndarray:
+        silence = np.zeros(55 * SAMPLE_RATE, dtype=np.float32)
+        return np.concatenate([silence, _recording(seed, seconds=5)])
+
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint_samples(mostly_silent(13)))
+    zero_postings = index.connection.execute("SELECT COUNT(*) FROM hashes WHERE hash = 0").fetchone()[0]
+
+    assert zero_postings == 0
+    assert index.lookup(fingerprint_samples(mostly_silent(14))) is None
+    index.close()
+
+
+def test_index_drops_common_hashes(tmp_path, monkeypatch):
+    """Test that values with too many postings are removed from the index and ignored."""
+    monkeypatch.setattr("transcribe_me.audio.fingerprint.MAX_POSTINGS", 1)
+    fingerprint = fingerprint_samples(_recording(15))
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint)
+    before = index.connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+    index.add("b.mp3", "b.txt", fingerprint)
+    after = index.connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    assert before > 0
+    assert after == 0
+    assert index.lookup(fingerprint) is None
+    index.close()
+
+
+def test_index_ignores_unrelated_recording(tmp_path):
+    """Test that unrelated audio does not match."""
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint_samples(_recording(8)))
+
+    assert index.lookup(fingerprint_samples(_recording(9))) is None
+    index.close()
+
+
+def test_index_persists_and_replaces(tmp_path):
+    """Test that entries survive reopening and re-adding a path replaces it."""
+    path = str(tmp_path / "fingerprints.db")
+    fingerprint = fingerprint_samples(_recording(10))
+    index = FingerprintIndex(path)
+    index.add("a.mp3", "old.txt", fingerprint)
+    index.add("a.mp3", "new.txt", fingerprint)
+    index.close()
+
+    index = FingerprintIndex(path)
+    match = index.lookup(fingerprint)
+    count = index.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    index.close()
+
+    assert match.transcript_path == "new.txt"
+    assert count == 1
+
+
+def test_index_lookup_excludes_own_entry(tmp_path):
+    """Test that a recording is never matched against its own entry."""
+    fingerprint = fingerprint_samples(_recording(16))
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    index.add("a.mp3", "a.txt", fingerprint)
+
+    assert index.lookup(fingerprint, exclude_path="a.mp3") is None
+    assert index.lookup(fingerprint).source_path == "a.mp3"
+    index.close()
+
+
+def test_deduplicate_retries_files_after_a_failed_run(tmp_path):
+    """Test that files whose earlier run failed are transcribed again, not deferred onto themselves."""
+    recording = _recording(17)
+    fingerprints = {
+        "input/a.mp3": fingerprint_samples(recording),
+        "input/b.mp3": fingerprint_samples(recording * 1.5),
+    }
+    config = {"deduplication": {"enabled": True, "index_path": str(tmp_path / "fingerprints.db")}}
+    a = ("input/a.mp3", str(tmp_path / "a.txt"))
+    b = ("input/b.mp3", str(tmp_path / "b.txt"))
+
+    with patch.object(transcription, "compute_fingerprint", side_effect=lambda path: fingerprints[path]):
+        first = transcription._deduplicate([a, b], config)
+        # The run failed, so neither transcript was written, and only A is queued again.
+        rerun_a = transcription._deduplicate([a], config)
+        rerun_b = transcription._deduplicate([b], config)
+
+    assert first == ([a], [(b[1], a[1])])
+    assert rerun_a == ([a], [])
+    assert rerun_b == ([b], [])
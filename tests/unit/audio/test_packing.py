@@ -0,0 +1,109 @@
+"""Unit tests for the packing module."""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from pydub import AudioSegment
+
+import transcribe_me.audio.transcription as transcription
+from transcribe_me.audio.packing import Clip, build_pack, plan_packs, split_segments
+
+
+def _tone(milliseconds: int) -> AudioSegment:
+    samples = (np.random.default_rng(0).standard_normal(16 * milliseconds) * 3000).astype(np.int16)
+    return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=16000, channels=1)
+
+
+def test_plan_packs_respects_duration_limit():
+    """Test that clips are grouped in order without exceeding the pack length."""
+    clips = [Clip(f"{i}.mp3", f"{i}.txt", 30_000) for i in range(5)]
+
+    packs = plan_packs(clips, max_pack_ms=70_000, separator_ms=1000)
+
+    assert [[clip.file_path for clip in pack] for pack in packs] == [
+        ["0.mp3", "1.mp3"],
+        ["2.mp3", "3.mp3"],
+        ["4.mp3"],
+    ]
+
+
+def test_plan_packs_respects_size_limit():
+    """Test that the upload size limit caps pack length when it is tighter."""
+    clips = [Clip(f"{i}.mp3", f"{i}.txt", 10_000) for i in range(4)]
+
+    packs = plan_packs(clips, max_pack_ms=600_000, max_pack_bytes=8 * 25_000, separator_ms=0)
+
+    assert [len(pack) for pack in packs] == [2, 2]
+
+
+def test_build_pack_inserts_separators():
+    """Test that clip spans account for the silence between clips."""
+    clips = [Clip("a.mp3", "a.txt", 1000), Clip("b.mp3", "b.txt", 2000)]
+    audio = {"a.mp3": _tone(1000), "b.mp3": _tone(2000)}
+
+    with patch("transcribe_me.audio.packing.load_audio", side_effect=audio.get):
+        packed, spans = build_pack(clips, separator_ms=500)
+
+    assert spans == [(0, 1000), (1500, 3500)]
+    assert len(packed) == 3500
+
+
+def test_split_segments_assigns_by_midpoint():
+    """Test that segments go to the clip containing them, or the nearest clip."""
+    spans = [(0, 1000), (1500, 3500)]
+    segments = [
+        (0, 900, " hello"),
+        (800, 1300, " there"),
+        (1400, 2500, " second"),
+        (2500, 3500, " clip"),
+    ]
+
+    assert split_segments(segments, spans) == ["hello there", "second clip"]
+
+
+def test_process_packed_writes_each_clip(tmp_path):
+    """Test that packed transcripts are written per file and long files are left over."""
+    pending = [(str(tmp_path / f"{name}.mp3"), str(tmp_path / f"{name}.txt")) for name in ("a", "b", "long")]
+    durations = {pending[0][0]: 20.0, pending[1][0]: 30.0, pending[2][0]: 3600.0}
+    report = transcription.RunReport()
+
+    with patch.object(transcription, "probe_durations", side_effect=lambda paths: [durations[p] for p in paths]), \
+         patch.object(transcription, "build_pack", return_value=(MagicMock(), [(0, 20_000), (21_500, 51_500)])), \
+         patch.object(transcription, "transcribe_chunk_segments",
+                      return_value=[(0, 19_000, "first"), (22_000, 50_000, "second")]) as segments, \
+         patch.object(transcription, "index_transcript") as index_transcript:
+        remaining = transcription._process_packed(pending, {"packing": {"enabled": True}}, report)
+
+    assert remaining == [pending[2]]
+    assert (tmp_path / "a.txt").read_text() == "first"
+    assert (tmp_path / "b.txt").read_text() == "second"
+    assert index_transcript.call_count == 2
+    assert report.files[pending[0][0]]["packed_with"] == 2
+    assert segments.call_args.kwargs["granularity"] == "word"
+
+
+def test_process_packed_keeps_scheduled_order(tmp_path):
+    """Test that clips from a failed pack are handed back in their scheduled place."""
+    pending = [(str(tmp_path / f"{name}.mp3"), str(tmp_path / f"{name}.txt")) for name in ("a", "long", "b")]
+    durations = {pending[0][0]: 20.0, pending[1][0]: 3600.0, pending[2][0]: 30.0}
+
+    with patch.object(transcription, "probe_durations", side_effect=lambda paths: [durations[p] for p in paths]), \
+         patch.object(transcription, "build_pack", return_value=(MagicMock(), [(0, 20_000), (21_500, 51_500)])), \
+         patch.object(transcription, "transcribe_chunk_segments", side_effect=RuntimeError("boom")):
+        remaining = transcription._process_packed(pending, {"packing": {"enabled": True}}, transcription.RunReport())
+
+    assert remaining == pending
+
+
+def test_request_chunk_segments_by_word(tmp_path):
+    """Test that word granularity asks Whisper for words and returns one entry per word."""
+    chunk = tmp_path / "pack.mp3"
+    chunk.write_bytes(b"audio")
+    client = MagicMock()
+    client.audio.transcriptions.create.return_value = MagicMock(
+        words=[{"start": 0.0, "end": 0.4, "word": "hello"}, {"start": 2.0, "end": 2.5, "word": "again"}]
+    )
+
+    words = transcription.request_chunk_segments(str(chunk), client=client, granularity="word")
+
+    assert words == [(0.0, 400.0, "hello"), (2000.0, 2500.0, "again")]
+    assert client.audio.transcriptions.create.call_args.kwargs["timestamp_granularities"] == ["word"]
@@ -0,0 +1,72 @@
+"""Unit tests for the planning module."""
+from unittest.mock import patch
+
+import pytest
+
+from transcribe_me.audio import planning
+from transcribe_me.audio.stats import LatencyStats
+
+
+@pytest.fixture
+def pending(tmp_path):
+    """Three inputs of 25 minutes, 30 seconds and 45 seconds."""
+    files = []
+    for name, size in (("long", 1000), ("memo1", 10), ("memo2", 10)):
+        path = tmp_path / f"{name}.mp3"
+        path.write_bytes(b"\0" * size)
+        files.append((str(path), str(tmp_path / f"{name}.txt")))
+    durations = dict(zip([path for path, _ in files], [1500.0, 30.0, 45.0]))
+    with patch.object(planning, "probe_durations", side_effect=lambda paths: [durations[p] for p in paths]):
+        yield files
+
+
+def test_build_plan_openai_chunks(pending, tmp_path):
+    """Test that OpenAI plans one request per 10-minute chunk."""
+    plan = planning.build_plan(pending, {}, LatencyStats(str(tmp_path / "stats.json")))
+
+    assert plan.provider == "openai"
+    assert plan.audio_seconds == 1575
+    assert plan.chunks == 5
+    assert plan.requests == 5
+    assert plan.upload_bytes == int(1575 * planning.CHUNK_BYTES_PER_SECOND)
+    assert plan.latency_basis == 0
+
+
+def test_build_plan_assemblyai_uploads_whole_files(pending, tmp_path):
+    """Test that AssemblyAI plans one request per file with the original file size."""
+    plan = planning.build_plan(pending, {"use_assemblyai": True}, LatencyStats(str(tmp_path / "stats.json")))
+
+    assert plan.requests == 3
+    assert plan.upload_bytes == 1020
+
+
+def test_build_plan_with_packing(pending, tmp_path):
+    """Test that packed clips share one request."""
+    config = {"packing": {"enabled": True}}
+
+    plan = planning.build_plan(pending, config, LatencyStats(str(tmp_path / "stats.json")))
+
+    assert plan.requests == 4
+
+
+def test_build_plan_uses_recorded_latency(pending, tmp_path):
+    """Test that latency from previous runs drives the time estimate."""
+    stats = LatencyStats(str(tmp_path / "stats.json"))
+    stats.record("openai", 60, 600)
+    stats.save()
+
+    plan = planning.build_plan(pending, {}, LatencyStats(str(tmp_path / "stats.json")))
+
+    assert plan.latency_basis == 1
+    assert plan.work_seconds == pytest.approx(157.5)
+    assert plan.longest_file_seconds == pytest.approx(150)
+
+
+def test_wall_seconds_bounds():
+    """Test that wall time respects concurrency, rate limit and the slowest file."""
+    plan = planning.Plan("openai", 10, 6000, 100, 0, 100, work_seconds=1000, longest_file_seconds=50, latency_basis=0)
+
+    assert plan.wall_seconds(concurrency=1) == 1000
+    assert plan.wall_seconds(concurrency=10) == 100
+    assert plan.wall_seconds(concurrency=100) == 50
+    assert plan.wall_seconds(concurrency=10, requests_per_minute=10) == 600
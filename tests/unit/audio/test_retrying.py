@@ -0,0 +1,163 @@
+"""Unit tests for the error-classified retry policy."""
+import json
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydub.exceptions import CouldntDecodeError
+
+from transcribe_me.audio import retrying, transcription
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class RateLimitError(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (StatusError(429), retrying.RATE_LIMIT),
+        (StatusError(503), retrying.SERVER_ERROR),
+        (StatusError(413), retrying.INVALID_INPUT),
+        (StatusError(401), retrying.REJECTED),
+        (CouldntDecodeError("bad header"), retrying.INVALID_INPUT),
+        (TimeoutError(), retrying.TIMEOUT),
+        (RateLimitError(), retrying.RATE_LIMIT),
+        (RuntimeError("something odd"), retrying.UNKNOWN),
+    ],
+)
+def test_classify_error(error, expected):
+    """Test that errors are classified by status code, then by type."""
+    assert retrying.classify_error(error) == expected
+
+
+def test_classify_error_follows_cause():
+    """Test that a wrapped error is classified by its cause."""
+    try:
+        try:
+            raise StatusError(415)
+        except StatusError as e:
+            raise RuntimeError("No provider available") from e
+    except RuntimeError as e:
+        assert retrying.classify_error(e) == retrying.INVALID_INPUT
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("Transcoding failed. File does not appear to contain audio.", retrying.INVALID_INPUT),
+        ("Audio duration is too short.", retrying.INVALID_INPUT),
+        ("Invalid API key", retrying.REJECTED),
+        ("Your current account balance is negative", retrying.REJECTED),
+        ("Internal server error", retrying.UNKNOWN),
+    ],
+)
+def test_transcript_failed_is_classified_by_message(message, expected):
+    """Test that failed AssemblyAI transcripts are classified from their error message."""
+    assert retrying.classify_error(retrying.transcript_failed(message)) == expected
+
+
+def test_wait_for_transcript_stops_at_deadline():
+    """Test that waiting on AssemblyAI gives up once the file's time is spent."""
+    transcriber = MagicMock()
+    transcriber.transcribe_async.return_value.result.side_effect = FutureTimeoutError()
+
+    with pytest.raises(retrying.DeadlineExceededError):
+        transcription.wait_for_transcript(transcriber, "memo.mp3", MagicMock(), timeout=5)
+
+    transcriber.transcribe_async.return_value.result.assert_called_once_with(timeout=5)
+    transcriber.transcribe.assert_not_called()
+
+
+def _run(policy, errors):
+    """Run a request that raises each of `errors` in turn, then succeeds."""
+    calls = []
+    for attempt in policy.retrying("memo.mp3"):
+        with attempt:
+            calls.append(1)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return len(calls)
+
+
+def test_permanent_errors_fail_fast():
+    """Test that an invalid input is not retried."""
+    policy = retrying.RetryPolicy()
+    policy._wait = lambda retry_state: 0
+
+    with pytest.raises(StatusError):
+        _run(policy, [StatusError(400), StatusError(503)])
+
+
+def test_budgets_are_per_class():
+    """Test that each error class has its own retry budget."""
+    policy = retrying.RetryPolicy({retrying.SERVER_ERROR: 1, retrying.RATE_LIMIT: 3})
+    policy._wait = lambda retry_state: 0
+
+    assert _run(policy, [StatusError(500), StatusError(429), StatusError(429), StatusError(429)]) == 5
+    with pytest.raises(StatusError, match="500"):
+        _run(policy, [StatusError(500), StatusError(500)])
+
+
+def test_deadline_stops_retries():
+    """Test that no retry is scheduled past the file's deadline."""
+    policy = retrying.RetryPolicy(deadline_seconds=2)
+
+    with pytest.raises(StatusError, match="429"):
+        _run(policy, [StatusError(429)])
+
+
+def test_retried_request_records_only_successful_attempt(tmp_path):
+    """Test that backoff before a retry is not counted as request latency."""
+    chunk = tmp_path / "chunk.mp3"
+    chunk.write_bytes(b"audio")
+    openai = MagicMock()
+    openai.audio.transcriptions.create.side_effect = [StatusError(503), MagicMock(text="hello")]
+    policy = retrying.RetryPolicy()
+    policy._wait = lambda retry_state: 0.3
+    report = transcription.RunReport()
+
+    with patch.object(transcription, "_import_openai", return_value=openai), \
+         patch.object(transcription, "probe_duration", return_value=60.0):
+        assert transcription.transcribe_chunk(str(chunk), policy, report) == "hello"
+
+    [(provider, seconds, audio_seconds)] = report.requests
+    assert provider == "openai"
+    assert seconds < 0.3
+    assert audio_seconds == 60.0
+
+
+def test_process_audio_files_continues_after_failures(tmp_path):
+    """Test that permanent failures are dead-lettered and transient ones left for the next run."""
+    input_folder = tmp_path / "input"
+    output_folder = tmp_path / "output"
+    input_folder.mkdir()
+    output_folder.mkdir()
+    for name in ("broken", "flaky", "good"):
+        (input_folder / f"{name}.mp3").write_bytes(b"")
+
+    def fake_transcribe(file_path, output_path, config, report=None):
+        if "broken" in file_path:
+            raise CouldntDecodeError("invalid data found")
+        if "flaky" in file_path:
+            raise StatusError(503)
+        with open(output_path, "w") as file:
+            file.write("hello")
+
+    config = {"retry": {"dead_letter_folder": str(tmp_path / "dead-letter")}}
+    with patch.object(transcription, "transcribe_audio", side_effect=fake_transcribe):
+        transcription.process_audio_files(str(input_folder), str(output_folder), config)
+
+    assert (output_folder / "good.txt").read_text() == "hello"
+    assert (input_folder / "flaky.mp3").exists()
+    assert not (input_folder / "broken.mp3").exists()
+    assert (tmp_path / "dead-letter" / "broken.mp3").exists()
+    record = json.loads((tmp_path / "dead-letter" / "broken.mp3.error.json").read_text())
+    assert record["class"] == retrying.INVALID_INPUT
+    assert "invalid data found" in record["error"]
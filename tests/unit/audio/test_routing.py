@@ -0,0 +1,124 @@
+"""Unit tests for the provider routing module."""
+from unittest.mock import patch
+
+import pytest
+
+import transcribe_me.audio.transcription as transcription
+from transcribe_me.audio.retrying import DeadlineExceededError
+from transcribe_me.audio.routing import CircuitBreaker, ProviderRouter
+
+
+def test_circuit_breaker_opens_after_threshold():
+    """Test that the breaker opens after consecutive failures and closes on success."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_half_open_allows_single_trial():
+    """Test that only one trial request is let through after the reset period."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.opened_at is not None
+
+
+def test_router_prefers_less_loaded_provider():
+    """Test that a busy provider loses to an idle one with the same latency."""
+    router = ProviderRouter({"routing": {"openai": {"max_concurrency": 2}}})
+
+    assert router.acquire(60) == "openai"
+    assert router.acquire(60) == "assemblyai"
+
+
+def test_router_respects_concurrency_caps():
+    """Test that the router fills both providers up to their configured caps."""
+    config = {
+        "routing": {
+            "openai": {"max_concurrency": 1},
+            "assemblyai": {"max_concurrency": 1},
+        }
+    }
+    router = ProviderRouter(config)
+
+    assert {router.acquire(60), router.acquire(60)} == {"openai", "assemblyai"}
+    assert router.total_concurrency == 2
+
+
+def test_router_skips_provider_with_open_breaker():
+    """Test that an open breaker removes the provider from consideration."""
+    router = ProviderRouter({"routing": {"failure_threshold": 1}})
+
+    provider = router.acquire(60)
+    router.release(provider, 60, 1.0, ok=False)
+
+    other = "assemblyai" if provider == "openai" else "openai"
+    assert router.acquire(60) == other
+    assert router.acquire(60, exclude=(other,)) is None
+
+
+def test_router_learns_latency():
+    """Test that slow responses steer new work to the faster provider."""
+    router = ProviderRouter({})
+    router.acquire(60, exclude=("assemblyai",))
+    router.release("openai", 60, 600.0, ok=True)
+
+    assert router.acquire(60) == "assemblyai"
+
+
+def test_transcribe_routed_fails_over():
+    """Test that a failure on one provider retries the file on the other."""
+    router = ProviderRouter({})
+    calls = []
+
+    def fake_transcribe(provider, file_path, output_path, config, report=None, policy=None):
+        calls.append(provider)
+        if len(calls) == 1:
+            raise RuntimeError("503 Service Unavailable")
+
+    with patch.object(transcription, "probe_duration", return_value=60.0), \
+         patch.object(transcription, "transcribe_with_provider", side_effect=fake_transcribe):
+        provider = transcription.transcribe_routed(router, "a.mp3", "a.txt", {})
+
+    assert len(calls) == 2
+    assert calls[0] != calls[1]
+    assert provider == calls[1]
+
+
+def test_transcribe_routed_raises_when_all_providers_fail():
+    """Test that the last error is reported once every provider has failed."""
+    router = ProviderRouter({})
+
+    with patch.object(transcription, "probe_duration", return_value=60.0), \
+         patch.object(transcription, "transcribe_with_provider", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError, match="boom"):
+            transcription.transcribe_routed(router, "a.mp3", "a.txt", {})
+
+
+def test_transcribe_routed_does_not_fail_over_past_deadline():
+    """Test that a file out of time is not failed over and does not count against the provider."""
+    router = ProviderRouter({})
+    calls = []
+
+    def fake_transcribe(provider, file_path, output_path, config, report=None, policy=None):
+        calls.append(provider)
+        raise DeadlineExceededError("Deadline passed before a.mp3 was transcribed")
+
+    with patch.object(transcription, "probe_duration", return_value=60.0), \
+         patch.object(transcription, "transcribe_with_provider", side_effect=fake_transcribe):
+        with pytest.raises(DeadlineExceededError):
+            transcription.transcribe_routed(router, "a.mp3", "a.txt", {})
+
+    assert len(calls) == 1
+    assert all(state.breaker.failures == 0 for state in router.providers.values())
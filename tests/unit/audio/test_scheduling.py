@@ -0,0 +1,152 @@
+"""Unit tests for the scheduling module."""
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from transcribe_me.audio.scheduling import Job, first_seen, job_score, order_jobs, read_priority
+
+
+def _touch(path, mtime):
+    path.write_bytes(b"")
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_read_priority_prefers_sidecar(tmp_path):
+    """Test that a sidecar file overrides filename patterns."""
+    audio = str(tmp_path / "urgent-call.mp3")
+    (tmp_path / "urgent-call.mp3.priority").write_text("3\n")
+
+    assert read_priority(audio, {"urgent-*": 10}) == 3
+
+
+def test_read_priority_uses_highest_matching_pattern(tmp_path):
+    """Test that the highest matching pattern wins and unmatched files default to 0."""
+    patterns = {"urgent-*": 10, "*-call.mp3": 5}
+
+    assert read_priority(str(tmp_path / "urgent-call.mp3"), patterns) == 10
+    assert read_priority(str(tmp_path / "other.mp3"), patterns) == 0
+
+
+def test_shortest_first_ages_long_jobs():
+    """Test that a long job overtakes a short one once it has waited long enough."""
+    now = 24 * 3600
+    fresh_short = Job("short.mp3", "short.txt", duration=120, submitted_at=now)
+    stale_long = Job("long.mp3", "long.txt", duration=1800, submitted_at=0)
+
+    assert job_score(fresh_short, "shortest_first", aging_rate=0, now=now) < \
+        job_score(stale_long, "shortest_first", aging_rate=0, now=now)
+    assert job_score(stale_long, "shortest_first", aging_rate=1.0, now=now) < \
+        job_score(fresh_short, "shortest_first", aging_rate=1.0, now=now)
+
+
+def test_order_jobs_shortest_first(tmp_path):
+    """Test that shortest_first orders by probed duration."""
+    pending = [(_touch(tmp_path / f"{name}.mp3", 1000), f"{name}.txt") for name in ("long", "short", "medium")]
+    durations = {pending[0][0]: 14400.0, pending[1][0]: 120.0, pending[2][0]: 900.0}
+
+    with patch("transcribe_me.audio.scheduling.probe_durations",
+               side_effect=lambda paths: [durations[p] for p in paths]):
+        ordered = order_jobs(pending, {"scheduling": {
+            "policy": "shortest_first", "aging_rate": 0, "queue_path": str(tmp_path / "queue.json"),
+        }})
+
+    assert [output for _, output in ordered] == ["short.txt", "medium.txt", "long.txt"]
+
+
+def test_order_jobs_oldest_first(tmp_path):
+    """Test that oldest_first orders by when files were first seen."""
+    pending = [
+        (_touch(tmp_path / "new.mp3", 1000), "new.txt"),
+        (_touch(tmp_path / "old.mp3", 3000), "old.txt"),
+    ]
+    queue_path = tmp_path / "queue.json"
+    queue_path.write_text(json.dumps({pending[0][0]: 3000, pending[1][0]: 1000}))
+
+    ordered = order_jobs(pending, {"scheduling": {"policy": "oldest_first", "queue_path": str(queue_path)}})
+
+    assert [output for _, output in ordered] == ["old.txt", "new.txt"]
+
+
+def test_first_seen_ignores_preserved_mtime(tmp_path):
+    """Test that a new file is stamped when found, not with its copied modification time."""
+    old = _touch(tmp_path / "old.mp3", 1000)
+    queue_path = str(tmp_path / "queue.json")
+    before = time.time() - 60
+
+    seen = first_seen([old], queue_path)
+
+    assert seen[old] >= before
+    assert first_seen([old], queue_path, now=seen[old] + 3600) == seen
+
+
+def test_first_seen_forgets_finished_files(tmp_path):
+    """Test that files no longer pending are dropped from the queue file."""
+    queue_path = tmp_path / "queue.json"
+    queue_path.write_text(json.dumps({"done.mp3": 1000, "waiting.mp3": 2000}))
+
+    first_seen(["waiting.mp3"], str(queue_path), now=5000)
+
+    assert json.loads(queue_path.read_text()) == {"waiting.mp3": 2000}
+
+
+def test_order_jobs_old_copies_do_not_jump_the_queue(tmp_path):
+    """Test that a long recording with a month-old mtime still runs after fresh short clips."""
+    month_ago = time.time() - 30 * 24 * 3600
+    pending = [
+        (_touch(tmp_path / "archive.mp3", month_ago), "archive.txt"),
+        (_touch(tmp_path / "clip.mp3", time.time()), "clip.txt"),
+    ]
+    durations = {pending[0][0]: 4 * 3600.0, pending[1][0]: 120.0}
+
+    with patch("transcribe_me.audio.scheduling.probe_durations",
+               side_effect=lambda paths: [durations[p] for p in paths]):
+        ordered = order_jobs(pending, {"scheduling": {"policy": "shortest_first", "queue_path": str(tmp_path / "queue.json")}})
+
+    assert [output for _, output in ordered] == ["clip.txt", "archive.txt"]
+
+
+def test_job_score_caps_aging():
+    """Test that waiting beyond max_aging_hours earns no further boost."""
+    day = Job("a.mp3", "a.txt", duration=3600, submitted_at=0)
+
+    capped = job_score(day, "shortest_first", aging_rate=0.1, now=30 * 24 * 3600, max_aging_hours=24)
+
+    assert capped == job_score(day, "shortest_first", aging_rate=0.1, now=24 * 3600, max_aging_hours=24)
+    assert capped[0] == pytest.approx(3600 / 3.4)
+
+
+def test_order_jobs_priority(tmp_path):
+    """Test that explicit priority runs first, with shorter jobs breaking ties."""
+    pending = [
+        (_touch(tmp_path / "a.mp3", 1000), "a.txt"),
+        (_touch(tmp_path / "urgent-b.mp3", 1000), "b.txt"),
+        (_touch(tmp_path / "c.mp3", 1000), "c.txt"),
+    ]
+    durations = {pending[0][0]: 600.0, pending[1][0]: 3600.0, pending[2][0]: 60.0}
+    config = {"scheduling": {
+        "policy": "priority", "aging_rate": 0, "priority_patterns": {"urgent-*": 1},
+        "queue_path": str(tmp_path / "queue.json"),
+    }}
+
+    with patch("transcribe_me.audio.scheduling.probe_durations",
+               side_effect=lambda paths: [durations[p] for p in paths]):
+        ordered = order_jobs(pending, config)
+
+    assert [output for _, output in ordered] == ["b.txt", "c.txt", "a.txt"]
+
+
+def test_order_jobs_fifo_keeps_order():
+    """Test that the default policy leaves the order untouched."""
+    pending = [("b.mp3", "b.txt"), ("a.mp3", "a.txt")]
+
+    assert order_jobs(pending, {}) == pending
+
+
+def test_order_jobs_rejects_unknown_policy():
+    """Test that an unknown policy is reported."""
+    with pytest.raises(ValueError, match="Unknown scheduling policy"):
+        order_jobs([], {"scheduling": {"policy": "random"}})
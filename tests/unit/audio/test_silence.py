@@ -0,0 +1,93 @@
+"""Unit tests for the silence compaction module."""
+import numpy as np
+from pydub import AudioSegment
+
+from transcribe_me.audio.report import RunReport
+from transcribe_me.audio.silence import OffsetMap, compact_silence, detect_silence_spans
+
+FRAME_RATE = 16000
+
+
+def _audio(*parts: tuple[str, int]) -> AudioSegment:
+    """Build mono 16-bit audio from ("tone" | "silence", milliseconds) parts."""
+    rng = np.random.default_rng(0)
+    samples = []
+    for kind, milliseconds in parts:
+        count = FRAME_RATE * milliseconds // 1000
+        if kind == "tone":
+            samples.append(rng.standard_normal(count) * 5000)
+        else:
+            samples.append(np.zeros(count))
+    data = np.concatenate(samples).astype(np.int16).tobytes()
+    return AudioSegment(data=data, sample_width=2, frame_rate=FRAME_RATE, channels=1)
+
+
+def test_detect_silence_spans():
+    """Test that only silences longer than the minimum are reported."""
+    audio = _audio(("tone", 1000), ("silence", 500), ("tone", 1000), ("silence", 3000), ("tone", 1000))
+
+    assert detect_silence_spans(audio, min_silence_ms=2000) == [(2500, 5500)]
+
+
+def test_detect_silence_spans_stereo_in_blocks(monkeypatch):
+    """Test that stereo audio analysed in small blocks finds the same spans."""
+    monkeypatch.setattr("transcribe_me.audio.silence.BLOCK_WINDOWS", 7)
+    mono = _audio(("tone", 1000), ("silence", 3000), ("tone", 1000))
+    stereo = AudioSegment.from_mono_audiosegments(mono, mono)
+
+    assert detect_silence_spans(stereo, min_silence_ms=2000) == [(1000, 4000)]
+
+
+def test_compact_silence_shortens_long_gaps():
+    """Test that long silences are cut down to the kept length."""
+    audio = _audio(("tone", 1000), ("silence", 10000), ("tone", 1000))
+
+    compacted, offset_map = compact_silence(audio, min_silence_ms=2000, keep_silence_ms=500)
+
+    assert len(compacted) == 2500
+    assert offset_map.original_ms == 12000
+    assert offset_map.compacted_ms == 2500
+    assert abs(offset_map.removed_ratio - 9500 / 12000) < 1e-9
+
+
+def test_offset_map_translates_timestamps():
+    """Test that positions after a removed gap map back to the original timeline."""
+    audio = _audio(("tone", 1000), ("silence", 10000), ("tone", 1000))
+    _, offset_map = compact_silence(audio, min_silence_ms=2000, keep_silence_ms=500)
+
+    assert offset_map.to_original(500) == 500
+    assert offset_map.to_original(1200) == 1200
+    assert offset_map.to_original(2000) == 11500
+
+
+def test_compact_silence_without_silence_is_identity():
+    """Test that audio with no long silence is left untouched."""
+    audio = _audio(("tone", 3000))
+
+    compacted, offset_map = compact_silence(audio)
+
+    assert compacted.raw_data == audio.raw_data
+    assert offset_map.segments == [(0, 0, 3000)]
+    assert offset_map.removed_ratio == 0
+
+
+def test_offset_map_round_trip(tmp_path):
+    """Test that offset maps can be saved and loaded."""
+    path = str(tmp_path / "a.offsets.json")
+    OffsetMap(5000, [(0, 0, 1000), (1000, 4000, 1000)]).save(path)
+
+    loaded = OffsetMap.load(path)
+
+    assert loaded.segments == [(0, 0, 1000), (1000, 4000, 1000)]
+    assert loaded.to_original(1500) == 4500
+
+
+def test_run_report_prints_removed_percentage(capsys):
+    """Test that the run report shows the share of silence removed per file."""
+    report = RunReport()
+    report.record("a.mp3", original_ms=60000, silence_removed_ms=15000)
+    report.print_summary()
+
+    output = capsys.readouterr().out
+    assert "a.mp3: silence removed 25.0%" in output
+    assert "Total: silence removed 25.0%" in output
@@ -0,0 +1,50 @@
+"""Unit tests for the tempo module."""
+import pytest
+
+from transcribe_me.audio.silence import OffsetMap
+from transcribe_me.audio.tempo import resolve_tempo, tempo_parameters, word_error_rate
+
+
+def test_resolve_tempo_disabled_by_default():
+    """Test that audio is left unchanged unless tempo is enabled."""
+    assert resolve_tempo("memo.mp3", {}) == 1.0
+    assert resolve_tempo("memo.mp3", {"tempo": {"factor": 1.5}}) == 1.0
+
+
+def test_resolve_tempo_profiles():
+    """Test that the first matching profile wins over the default factor."""
+    config = {"tempo": {"enabled": True, "factor": 1.25, "profiles": {"dictation-*": 1.5, "*": 1.1}}}
+
+    assert resolve_tempo("input/dictation-01.mp3", config) == 1.5
+    assert resolve_tempo("input/meeting.mp3", config) == 1.1
+    assert resolve_tempo("meeting.mp3", {"tempo": {"enabled": True, "factor": 1.25}}) == 1.25
+    assert resolve_tempo("meeting.mp3", {"tempo": {"enabled": True, "factor": 4}}) == 2.0
+
+
+def test_tempo_parameters():
+    """Test that the atempo filter is only added when the tempo changes."""
+    assert tempo_parameters(1.0) == []
+    assert tempo_parameters(1.25) == ["-filter:a", "atempo=1.25"]
+
+
+def test_word_error_rate():
+    """Test substitutions, insertions and deletions against the reference word count."""
+    assert word_error_rate("The quick brown fox.", "the quick, brown fox") == 0.0
+    assert word_error_rate("the quick brown fox", "the quack brown fox") == pytest.approx(0.25)
+    assert word_error_rate("the quick brown fox", "the brown fox jumps") == pytest.approx(0.5)
+    assert word_error_rate("", "") == 0.0
+    assert word_error_rate("", "noise") == 1.0
+
+
+def test_offset_map_rescales_tempo(tmp_path):
+    """Test that uploaded positions are stretched by the tempo before mapping."""
+    offset_map = OffsetMap(20000, [(0, 0, 1000), (1000, 11000, 9000)], tempo=1.5)
+    path = str(tmp_path / "memo.offsets.json")
+    offset_map.save(path)
+
+    loaded = OffsetMap.load(path)
+
+    assert loaded.tempo == 1.5
+    assert loaded.to_original(400) == 600
+    assert loaded.to_original(2000) == 13000
+    assert OffsetMap.identity(6000, tempo=2.0).to_original(1000) == 2000
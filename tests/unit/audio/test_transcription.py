@@ -263,7 +263,7 @@ def test_transcribe_with_assemblyai():
     # Create a mock for the transcriber
     mock_transcriber = MagicMock()
     mock_transcript = MockTranscript()
-    mock_transcriber.transcribe.return_value = mock_transcript
+    mock_transcriber.transcribe_async.return_value.result.return_value = mock_transcript
     
     # Create a mock file for writing the output
     mock_output_file = MagicMock()
@@ -282,6 +282,8 @@ def test_transcribe_with_assemblyai():
     class MockAssemblyAI:
         def __init__(self):
             self.Transcriber = MagicMock(return_value=mock_transcriber)
+            self.Client = MagicMock()
+            self.Settings = MagicMock()
             self.TranscriptionConfig = MagicMock(return_value=MagicMock())
             self.SpeechModel = MagicMock()
             self.SpeechModel.nano = "nano"
@@ -310,7 +312,7 @@ def test_transcribe_with_assemblyai():
         # Verify the result - the function should return the transcript text
         mock_output_file_handle.write.assert_called_once_with("This is a test transcription.")
         mock_assemblyai.Transcriber.assert_called_once()
-        mock_transcriber.transcribe.assert_called_once()
+        mock_transcriber.transcribe_async.assert_called_once()
 
 
 def test_transcribe_audio_openai():
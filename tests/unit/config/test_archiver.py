@@ -0,0 +1,145 @@
+"""Unit tests for the archiver module."""
+import io
+import json
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+from transcribe_me.config import archiver
+
+
+@pytest.fixture(params=["zstd", "gzip"])
+def codec(request):
+    """Run each test with zstandard available and with the gzip fallback."""
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+        yield "zstd"
+    else:
+        with patch.object(archiver, "_import_zstandard", return_value=None):
+            yield "gzip"
+
+
+def _sources(tmp_path, count=5):
+    folder = tmp_path / "output"
+    folder.mkdir()
+    sources = []
+    for i in range(count):
+        path = folder / f"transcript{i}.txt"
+        path.write_text(f"transcript number {i} " * (i + 1) * 100)
+        sources.append((str(path), f"output/transcript{i}.txt"))
+    return sources
+
+
+def test_write_bundle_is_a_valid_tar(tmp_path, codec):
+    """Test that the concatenated frames still form an archive standard tools can read."""
+    sources = _sources(tmp_path)
+    bundle_path, manifest = archiver.write_bundle(sources, str(tmp_path / "bundle"))
+
+    assert manifest["codec"] == codec
+    if codec == "gzip":
+        tar = tarfile.open(bundle_path, "r:gz")
+    else:
+        import zstandard
+        with open(bundle_path, "rb") as file:
+            reader = zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True)
+            tar = tarfile.open(fileobj=io.BytesIO(reader.read()))
+    with tar:
+        assert tar.getnames() == [arcname for _, arcname in sources]
+    assert json.loads(open(archiver.manifest_path(bundle_path)).read()) == manifest
+
+
+def test_verify_bundle_detects_corruption(tmp_path, codec):
+    """Test that a bundle is checked against its manifest."""
+    bundle_path, manifest = archiver.write_bundle(_sources(tmp_path), str(tmp_path / "bundle"))
+    archiver.verify_bundle(bundle_path, manifest)
+
+    manifest["files"][2]["sha256"] = "0" * 64
+    with pytest.raises(archiver.ArchiveVerificationError):
+        archiver.verify_bundle(bundle_path, manifest)
+
+
+def test_restore_member_reads_single_frame(tmp_path, codec):
+    """Test that one file is restored from its manifest entry alone."""
+    sources = _sources(tmp_path)
+    bundle_path, _ = archiver.write_bundle(sources, str(tmp_path / "bundle"))
+
+    restored = archiver.restore_member(bundle_path, "output/transcript3.txt", str(tmp_path / "restored"))
+
+    assert open(restored).read() == open(sources[3][0]).read()
+    with pytest.raises(FileNotFoundError):
+        archiver.restore_member(bundle_path, "output/missing.txt", str(tmp_path / "restored"))
+
+
+def test_archive_renames_on_same_filesystem(tmp_path):
+    """Test that files on the archive's filesystem are renamed, not copied."""
+    sources = _sources(tmp_path, count=2)
+
+    summary = archiver.archive(sources, str(tmp_path / "archive"), "20240101_000000")
+
+    assert summary["renamed"] == 2
+    assert summary["bundle"] is None
+    assert (tmp_path / "archive" / "20240101_000000" / "output" / "transcript1.txt").exists()
+    assert not (tmp_path / "output" / "transcript1.txt").exists()
+
+
+def test_archive_bundles_when_requested(tmp_path, codec):
+    """Test that bundling removes sources only after the bundle is written."""
+    sources = _sources(tmp_path, count=3)
+
+    summary = archiver.archive(sources, str(tmp_path / "archive"), "20240101_000000", bundle=True)
+
+    assert summary["bundled"] == 3
+    assert summary["compressed_bytes"] < summary["bytes"]
+    assert not any((tmp_path / "output").iterdir())
+
+
+def test_archive_bundles_across_filesystems(tmp_path, codec):
+    """Test that sources on another filesystem go into the bundle."""
+    sources = _sources(tmp_path, count=2)
+
+    with patch.object(archiver, "_same_filesystem", return_value=False):
+        summary = archiver.archive(sources, str(tmp_path / "archive"), "20240101_000000")
+
+    assert summary["renamed"] == 0
+    assert summary["bundled"] == 2
+
+
+def test_archive_splits_sources_by_filesystem(tmp_path, codec):
+    """Test that each source is either renamed or bundled, never both."""
+    sources = _sources(tmp_path, count=4)
+    local = {sources[0][0], sources[2][0]}
+
+    with patch.object(archiver, "_same_filesystem", side_effect=lambda path, folder: path in local):
+        summary = archiver.archive(sources, str(tmp_path / "archive"), "20240101_000000")
+
+    assert summary["renamed"] == 2
+    assert summary["bundled"] == 2
+    assert len(summary["moved"]) == 4
+    assert not any((tmp_path / "output").iterdir())
+
+
+def test_archive_moves_nothing_when_verification_fails(tmp_path, codec):
+    """Test that a bundle failing verification leaves renamable sources in place too."""
+    sources = _sources(tmp_path, count=2)
+
+    with patch.object(archiver, "_same_filesystem", side_effect=lambda path, folder: path == sources[0][0]), \
+         patch.object(archiver, "verify_bundle", side_effect=archiver.ArchiveVerificationError("corrupt")):
+        with pytest.raises(archiver.ArchiveVerificationError):
+            archiver.archive(sources, str(tmp_path / "archive"), "20240101_000000")
+
+    assert all((tmp_path / "output" / f"transcript{i}.txt").exists() for i in range(2))
+
+
+def test_write_bundle_streams_large_members(tmp_path, codec):
+    """Test that members larger than the read and spool sizes round-trip intact."""
+    path = tmp_path / "recording.mp3"
+    path.write_bytes(bytes(range(256)) * 4096 + b"tail")
+
+    with patch.object(archiver, "READ_SIZE", 1000), patch.object(archiver, "SPOOL_SIZE", 1000):
+        bundle_path, manifest = archiver.write_bundle([(str(path), "input/recording.mp3")], str(tmp_path / "bundle"))
+        archiver.verify_bundle(bundle_path, manifest)
+        restored = archiver.restore_member(bundle_path, "input/recording.mp3", str(tmp_path / "restored"))
+
+    assert manifest["files"][0]["size"] == path.stat().st_size
+    assert open(restored, "rb").read() == path.read_bytes()
@@ -0,0 +1,143 @@
+"""Unit tests for the async library API."""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydub import AudioSegment
+
+import transcribe_me.api as api
+import transcribe_me.audio.transcription as transcription
+from transcribe_me import TranscriptionOptions, transcribe, transcribe_stream
+from transcribe_me.config import ConfigValidationError
+
+
+@pytest.fixture
+def fake_audio():
+    """Decode to 25 minutes of synthetic audio and skip MP3 encoding."""
+    with patch.object(api, "_decode", return_value=AudioSegment.silent(duration=25 * 60 * 1000, frame_rate=16000)), \
+         patch.object(AudioSegment, "export", lambda self, path, **kwargs: open(path, "wb")):
+        yield
+
+
+def test_transcribe_assembles_chunks(fake_audio):
+    """Test that chunks are transcribed and timestamps are offset per chunk."""
+    def fake_request(file_path, options, timeout=None):
+        return [(0, 1000, f" hello from {file_path.rsplit('chunk', 1)[1]}")]
+
+    with patch.object(api, "_request", side_effect=fake_request):
+        result = asyncio.run(transcribe("meeting.mp3"))
+
+    assert [chunk.start_ms for chunk in result.chunks] == [0, 600_000, 1_200_000]
+    assert result.chunks[1].segments == [(600_000, 601_000, "hello from 1.mp3")]
+    assert result.text == "hello from 0.mp3 hello from 1.mp3 hello from 2.mp3"
+
+
+def test_transcribe_rescales_tempo_timestamps(fake_audio):
+    """Test that sped-up chunks cover more audio and timestamps return to the original timeline."""
+    with patch.object(api, "_request", return_value=[(0, 1000, "text")]):
+        result = asyncio.run(transcribe("dictation.mp3", TranscriptionOptions(tempo=1.5)))
+
+    assert [chunk.start_ms for chunk in result.chunks] == [0, 900_000]
+    assert result.chunks[1].segments == [(900_000, 901_500, "text")]
+    assert result.chunks[0].end_ms == 900_000
+
+
+def test_transcribe_stream_yields_in_order(fake_audio):
+    """Test that streamed chunks arrive in order even when later ones finish first."""
+    def fake_request(file_path, options, timeout=None):
+        if file_path.endswith("chunk0.mp3"):
+            time.sleep(0.05)
+        return [(0, 1000, file_path[-10:])]
+
+    async def collect():
+        return [chunk.index async for chunk in transcribe_stream(b"audio", TranscriptionOptions(max_concurrency=3))]
+
+    with patch.object(api, "_request", side_effect=fake_request):
+        assert asyncio.run(collect()) == [0, 1, 2]
+
+
+def test_transcribe_times_out(fake_audio):
+    """Test that the overall timeout is enforced."""
+    def slow_request(file_path, options, timeout=None):
+        time.sleep(0.5)
+        return []
+
+    with patch.object(api, "_request", side_effect=slow_request):
+        with pytest.raises(TimeoutError):
+            asyncio.run(transcribe("meeting.mp3", TranscriptionOptions(timeout=0.1)))
+
+
+def test_transcribe_raises_after_retries(fake_audio):
+    """Test that a chunk failing every attempt raises TranscriptionError."""
+    calls = []
+
+    def failing_request(file_path, options, timeout=None):
+        calls.append(file_path)
+        raise RuntimeError("500 Internal Server Error")
+
+    with patch.object(api, "_request", side_effect=failing_request), \
+         patch.object(api, "wait_exponential", return_value=lambda retry_state: 0):
+        with pytest.raises(api.TranscriptionError, match="500"):
+            asyncio.run(transcribe("meeting.mp3", TranscriptionOptions(max_attempts=2, max_concurrency=1)))
+
+    assert len(calls) == 2
+
+
+def test_transcribe_does_not_print(fake_audio, capsys):
+    """Test that the library API writes nothing to stdout or stderr."""
+    with patch.object(api, "_request", return_value=[(0, 1000, "text")]):
+        asyncio.run(transcribe("meeting.mp3"))
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == ""
+
+
+def test_options_from_config():
+    """Test that options can be built from a validated configuration dictionary."""
+    config = {"use_assemblyai": True, "input_folder": "input", "output_folder": "output"}
+
+    options = TranscriptionOptions.from_config(config, timeout=30)
+
+    assert options.provider == "assemblyai"
+    assert options.timeout == 30
+    with pytest.raises(ConfigValidationError):
+        TranscriptionOptions.from_config({"use_assemblyai": "yes"})
+
+
+def test_options_from_config_without_folders():
+    """Test that library callers do not need the CLI's folder keys."""
+    options = TranscriptionOptions.from_config({"tempo": {"enabled": True, "factor": 1.5}})
+
+    assert options.provider == "openai"
+    assert options.tempo == 1.5
+
+
+def test_transcribe_passes_remaining_time_to_requests(fake_audio):
+    """Test that each request is given the time left, so it stops at the deadline."""
+    timeouts = []
+
+    def fake_request(file_path, options, timeout=None):
+        timeouts.append(timeout)
+        return []
+
+    with patch.object(api, "_request", side_effect=fake_request):
+        asyncio.run(transcribe("meeting.mp3", TranscriptionOptions(timeout=60)))
+
+    assert len(timeouts) == 3
+    assert all(0 < timeout <= 60 for timeout in timeouts)
+
+
+def test_assemblyai_requests_use_their_own_settings():
+    """Test that an API key is set on a per-call client, not the SDK's global settings."""
+    aai = MagicMock()
+    aai.Transcriber.return_value.transcribe_async.return_value.result.return_value = MagicMock(words=[])
+
+    with patch.object(transcription, "_import_assemblyai", return_value=aai):
+        transcription.transcribe_segments_with_assemblyai("memo.mp3", api_key="key", timeout=30)
+
+    aai.Settings.assert_called_once_with(api_key="key", http_timeout=30)
+    assert aai.Transcriber.call_args.kwargs["client"] is aai.Client.return_value
+    assert not isinstance(aai.settings.api_key, str)
+    aai.Transcriber.return_value.transcribe_async.return_value.result.assert_called_once_with(timeout=30)
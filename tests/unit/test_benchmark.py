@@ -0,0 +1,25 @@
+"""Unit tests for the tempo benchmark."""
+from unittest.mock import patch
+
+import pytest
+
+import transcribe_me.benchmark as benchmark
+from transcribe_me import TranscriptionOptions, TranscriptionResult
+
+
+def test_benchmark_folder_reports_savings_and_drift(tmp_path, capsys):
+    """Test that each tempo is compared with the unmodified transcript."""
+    (tmp_path / "memo.mp3").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    transcripts = {1.0: "please call me back tomorrow", 1.25: "please call me back tomorrow", 2.0: "please fall back tomorrow"}
+
+    async def fake_transcribe(file_path, options):
+        return TranscriptionResult(text=transcripts[options.tempo], chunks=[])
+
+    with patch.object(benchmark, "transcribe", side_effect=fake_transcribe), \
+         patch.object(benchmark, "probe_duration", return_value=600.0):
+        results = benchmark.benchmark_folder(str(tmp_path), TranscriptionOptions(), tempos=(1.25, 2.0))
+
+    assert [(result.tempo, result.word_error_rate) for result in results] == [(1.25, 0.0), (2.0, pytest.approx(0.4))]
+    assert results[1].saved_seconds == 300
+    assert "Total at 2x: saved 5m 0s of 10m 0s" in capsys.readouterr().out
@@ -0,0 +1,93 @@
+"""Unit tests for the transcript search index."""
+import os
+
+import pytest
+
+from transcribe_me import search
+from transcribe_me.config import archiver
+
+
+@pytest.fixture
+def output(tmp_path):
+    """An output folder with two transcripts, one with segment timestamps."""
+    folder = tmp_path / "output"
+    folder.mkdir()
+    (folder / "standup.txt").write_text("We agreed to ship the billing migration on Friday.")
+    (folder / "planning.txt").write_text("Budget review first. Then the quarterly roadmap.")
+    search.write_segments(
+        str(folder / "planning.txt"),
+        [(0, 600_000, "Budget review first."), (600_000, 1_200_000, "Then the quarterly roadmap.")],
+    )
+    return folder
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "state" / "search.db")
+
+
+def test_search_returns_ranked_hits_with_timestamps(output, index_path):
+    """Test that segment passages carry their offset in the recording."""
+    assert search.rebuild_index([str(output)], index_path) == 2
+
+    hits = search.search_transcripts("quarterly roadmaps", index_path=index_path)
+
+    assert len(hits) == 1
+    assert hits[0].path == os.path.abspath(output / "planning.txt")
+    assert hits[0].start_ms == 600_000
+    assert "[quarterly]" in hits[0].snippet
+    assert search.search_transcripts("billing", index_path=index_path)[0].start_ms is None
+    assert search.search_transcripts('ship "billing-', index_path=index_path)
+
+
+def test_add_replaces_previous_entry(output, index_path):
+    """Test that re-indexing a changed transcript drops its old passages."""
+    search.index_transcript(str(output / "standup.txt"), index_path=index_path)
+    (output / "standup.txt").write_text("Postponed to next week.")
+    search.index_transcript(str(output / "standup.txt"), index_path=index_path)
+
+    assert search.search_transcripts("billing", index_path=index_path) == []
+    assert len(search.search_transcripts("postponed", index_path=index_path)) == 1
+
+
+def test_rebuild_skips_unchanged_and_prunes_missing(output, index_path):
+    """Test that rebuilding is incremental and forgets deleted transcripts."""
+    search.rebuild_index([str(output)], index_path)
+    os.remove(output / "standup.txt")
+
+    assert search.rebuild_index([str(output)], index_path) == 0
+    assert search.search_transcripts("billing", index_path=index_path) == []
+
+
+def test_archive_moves_are_relocated(output, tmp_path, index_path):
+    """Test that hits follow transcripts into renamed folders and bundles."""
+    search.rebuild_index([str(output)], index_path)
+    sources = [(str(output / "standup.txt"), "output/standup.txt")]
+
+    summary = archiver.archive(sources, str(tmp_path / "archive"), "20240101", bundle=True)
+    assert search.relocate_transcripts(summary["moved"], index_path) == 1
+
+    hit = search.search_transcripts("billing", index_path=index_path)[0]
+    assert hit.path == f"{summary['bundle']}#output/standup.txt"
+    search.rebuild_index([str(output)], index_path)
+    assert search.search_transcripts("billing", index_path=index_path)[0].path == hit.path
+
+    search.relocate_transcripts([(str(output), str(tmp_path / "archive" / "moved"))], index_path)
+    assert search.search_transcripts("budget", index_path=index_path)[0].path == str(
+        tmp_path / "archive" / "moved" / "planning.txt"
+    )
+
+
+def test_search_folder_rebuilds_lost_index(output, tmp_path, index_path, capsys):
+    """Test that a missing index is rebuilt from the output folder before searching."""
+    hits = search.search_folder("budget", str(output), str(tmp_path / "archive"), index_path=index_path)
+
+    assert len(hits) == 1
+    out = capsys.readouterr().out
+    assert "Indexed 2 transcripts" in out
+    assert "planning.txt @ 0:00:00" in out
+
+
+def test_format_timestamp():
+    assert search.format_timestamp(None) == ""
+    assert search.format_timestamp(3_725_000) == "1:02:05"
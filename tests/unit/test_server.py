@@ -0,0 +1,180 @@
+"""Unit tests for the HTTP job service."""
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import transcribe_me.server as server
+from transcribe_me.api import ChunkResult, TranscriptionOptions
+
+
+async def fake_stream(source, options):
+    for index in range(2):
+        yield ChunkResult(index=index, start_ms=index * 1000, end_ms=(index + 1) * 1000, text=f"part {index}")
+
+
+async def failing_stream(source, options):
+    raise RuntimeError("provider unavailable")
+    yield
+
+
+@pytest.fixture
+def service_url():
+    """Run a service and HTTP server on a free port for the duration of a test."""
+    def start(stream=fake_stream, workers=1, queue_size=10):
+        patcher = patch.object(server, "transcribe_stream", stream)
+        patcher.start()
+        service = server.TranscriptionService(TranscriptionOptions(), workers=workers, queue_size=queue_size)
+        service.start()
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.make_handler(service))
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        started.append((patcher, service, httpd))
+        return f"http://127.0.0.1:{httpd.server_port}", service
+
+    started = []
+    yield start
+    for patcher, service, httpd in started:
+        httpd.shutdown()
+        httpd.server_close()
+        service.stop()
+        patcher.stop()
+
+
+def _request(url, data=None, headers=None):
+    request = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _raw(url, request):
+    """Send raw request bytes and return everything the server replies before closing."""
+    host, port = url.rsplit("/", 1)[-1].split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as connection:
+        connection.sendall(request)
+        response = b""
+        while chunk := connection.recv(65536):
+            response += chunk
+    return response
+
+
+def _wait(service, job_id):
+    job = service.get(job_id)
+    with job.changed:
+        job.changed.wait_for(lambda: job.finished, timeout=5)
+    return job
+
+
+def test_upload_and_fetch_result(service_url):
+    """Test that an uploaded file is transcribed and its result can be fetched."""
+    url, service = service_url()
+
+    status, body = _request(f"{url}/jobs", data=b"audio", headers={"X-Filename": "memo.mp3"})
+    job_id = json.loads(body)["id"]
+    assert status == 202
+
+    _wait(service, job_id)
+    status, body = _request(f"{url}/jobs/{job_id}/result")
+    result = json.loads(body)
+
+    assert status == 200
+    assert result["status"] == "done"
+    assert result["text"] == "part 0 part 1"
+    assert len(result["segments"]) == 2
+    assert os.listdir(service.spool) == []
+
+
+def test_submit_local_path(service_url, tmp_path):
+    """Test that jobs can reference a local file instead of uploading it."""
+    url, service = service_url()
+    audio = tmp_path / "memo.mp3"
+    audio.write_bytes(b"audio")
+
+    status, body = _request(
+        f"{url}/jobs", data=json.dumps({"path": str(audio)}).encode(), headers={"Content-Type": "application/json"}
+    )
+    assert status == 202
+    assert _wait(service, json.loads(body)["id"]).status == "done"
+
+    status, _ = _request(
+        f"{url}/jobs", data=json.dumps({"path": str(tmp_path / "missing.mp3")}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    assert status == 400
+
+
+def test_stream_returns_chunks_then_status(service_url):
+    """Test that the stream endpoint sends each chunk followed by the final status."""
+    url, _ = service_url()
+
+    _, body = _request(f"{url}/jobs", data=b"audio")
+    _, stream = _request(f"{url}/jobs/{json.loads(body)['id']}/stream")
+    lines = [json.loads(line) for line in stream.decode().splitlines()]
+
+    assert [line.get("text") for line in lines[:2]] == ["part 0", "part 1"]
+    assert lines[-1]["status"] == "done"
+
+
+def test_failed_job_reports_error(service_url):
+    """Test that provider failures are reported on the job."""
+    url, service = service_url(stream=failing_stream)
+
+    _, body = _request(f"{url}/jobs", data=b"audio")
+    job_id = json.loads(body)["id"]
+    _wait(service, job_id)
+    status, body = _request(f"{url}/jobs/{job_id}/result")
+
+    assert status == 500
+    assert json.loads(body)["error"] == "provider unavailable"
+
+
+def test_full_queue_rejects_jobs(service_url):
+    """Test that submissions beyond the queue capacity are rejected."""
+    url, _ = service_url(workers=0, queue_size=1)
+
+    assert _request(f"{url}/jobs", data=b"audio")[0] == 202
+    assert _request(f"{url}/jobs", data=b"audio")[0] == 503
+    _, body = _request(f"{url}/metrics")
+
+    metrics = json.loads(body)
+    assert metrics["rejected"] == 1
+    assert metrics["queued"] == 1
+
+
+def test_health_and_unknown_job(service_url):
+    """Test the health endpoint and lookups of unknown jobs."""
+    url, _ = service_url()
+
+    assert _request(f"{url}/health") == (200, b'{"status": "ok"}')
+    assert _request(f"{url}/jobs/unknown")[0] == 404
+
+
+def test_invalid_content_length_is_rejected(service_url):
+    """Test that a malformed Content-Length gets a 400 and the connection is closed."""
+    url, _ = service_url()
+
+    response = _raw(url, b"POST /jobs HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\naudio")
+
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"Connection: close" in response
+
+
+def test_oversized_upload_closes_connection(service_url):
+    """Test that the unread body of a rejected upload is not parsed as another request."""
+    url, _ = service_url()
+    smuggled = b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+    with patch.object(server, "MAX_UPLOAD_BYTES", 8):
+        response = _raw(url, b"POST /jobs HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n%s"
+                        % (len(smuggled), smuggled))
+
+    assert response.startswith(b"HTTP/1.1 413")
+    assert response.count(b"HTTP/1.1 ") == 1
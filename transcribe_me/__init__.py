@@ -1,3 +1,12 @@
 """Transcribe Me - A CLI tool to transcribe audio files."""
 
 __version__ = "1.0.1"
+
+from .api import (
+    ChunkResult,
+    TranscriptionError,
+    TranscriptionOptions,
+    TranscriptionResult,
+    transcribe,
+    transcribe_stream,
+)
@@ -0,0 +1,255 @@
+"""
+Async API for embedding transcription in other programs.
+
+Unlike the CLI, nothing here reads `.transcribe.yaml`, prints, or exits: settings
+come from an explicit `TranscriptionOptions`, and failures are raised.
+
+Example:
+    >>> from transcribe_me import transcribe, TranscriptionOptions
+    >>> result = await transcribe("meeting.mp3", TranscriptionOptions(timeout=600))
+    >>> print(result.text)
+"""
+import asyncio
+import dataclasses
+import io
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from pydub import AudioSegment
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from .audio.retrying import is_retryable
+from .audio.silence import OffsetMap, compact_silence
+from .audio.tempo import tempo_parameters
+from .audio.transcription import openai_client, request_chunk_segments, transcribe_segments_with_assemblyai
+from .config.config_manager import DEFAULT_INPUT_FOLDER, DEFAULT_OUTPUT_FOLDER, validate_config
+
+Source = Union[str, os.PathLike, bytes]
+# Keys the CLI schema requires that mean nothing to a library caller.
+CLI_DEFAULTS = {"use_assemblyai": False, "input_folder": DEFAULT_INPUT_FOLDER, "output_folder": DEFAULT_OUTPUT_FOLDER}
+
+
+class TranscriptionError(Exception):
+    """Raised when a chunk could not be transcribed after all retries."""
+
+
+@dataclass
+class TranscriptionOptions:
+    """Settings for a single transcription, in place of `.transcribe.yaml`."""
+
+    provider: str = "openai"
+    api_key: Optional[str] = None
+    language: str = "en"
+    model: str = "whisper-1"
+    chunk_minutes: int = 10
+    max_concurrency: int = 2
+    max_attempts: int = 5
+    timeout: Optional[float] = None
+    silence_compaction: Optional[Dict[str, Any]] = None
+    tempo: float = 1.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **overrides: Any) -> "TranscriptionOptions":
+        """
+        Build options from a configuration dictionary with the same layout as `.transcribe.yaml`.
+
+        The folder keys and `use_assemblyai` that the CLI requires are optional here.
+
+        Raises:
+            ConfigValidationError: If the configuration does not match the schema.
+        """
+        validate_config({**CLI_DEFAULTS, **config})
+        tempo = config.get("tempo") or {}
+        options = cls(
+            provider="assemblyai" if config.get("use_assemblyai", False) else "openai",
+            silence_compaction=config.get("silence_compaction"),
+            tempo=tempo.get("factor", 1.0) if tempo.get("enabled", False) else 1.0,
+        )
+        return dataclasses.replace(options, **overrides)
+
+
+@dataclass
+class ChunkResult:
+    """The transcript of one chunk, with timestamps on the original recording's timeline."""
+
+    index: int
+    start_ms: float
+    end_ms: float
+    text: str
+    segments: list[tuple[float, float, str]] = field(default_factory=list)
+
+
+@dataclass
+class TranscriptionResult:
+    """The full transcript of a recording and the chunks it was assembled from."""
+
+    text: str
+    chunks: list[ChunkResult]
+
+
+def _decode(source: Source) -> AudioSegment:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return AudioSegment.from_file(io.BytesIO(bytes(source)))
+    return AudioSegment.from_file(os.fspath(source))
+
+
+async def _within(awaitable: Any, deadline: Optional[float]) -> Any:
+    """Await `awaitable`, raising TimeoutError if `deadline` passes first."""
+    if deadline is None:
+        return await awaitable
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        if asyncio.isfuture(awaitable):
+            awaitable.cancel()
+        elif asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise TimeoutError("Transcription timed out")
+    return await asyncio.wait_for(awaitable, remaining)
+
+
+def _request(
+    file_path: str, options: TranscriptionOptions, timeout: Optional[float] = None
+) -> list[tuple[float, float, str]]:
+    """Make one provider request, abandoning it after `timeout` seconds so the worker thread is freed."""
+    if options.provider == "assemblyai":
+        return transcribe_segments_with_assemblyai(file_path, options.api_key, timeout)
+    return request_chunk_segments(
+        file_path,
+        client=openai_client(options.api_key),
+        language=options.language,
+        model=options.model,
+        timeout=timeout,
+    )
+
+
+async def _transcribe_range(
+    audio: AudioSegment,
+    index: int,
+    start_ms: int,
+    end_ms: int,
+    workdir: str,
+    options: TranscriptionOptions,
+    offset_map: Optional[OffsetMap],
+    semaphore: asyncio.Semaphore,
+    deadline: Optional[float] = None,
+) -> ChunkResult:
+    async with semaphore:
+        chunk_path = os.path.join(workdir, f"chunk{index}.mp3")
+        parameters = tempo_parameters(options.tempo)
+        await asyncio.to_thread(
+            lambda: audio[start_ms:end_ms].export(chunk_path, format="mp3", parameters=parameters).close()
+        )
+        try:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception(is_retryable),
+                stop=stop_after_attempt(options.max_attempts),
+                wait=wait_exponential(multiplier=1, min=4, max=60),
+                reraise=True,
+            ):
+                with attempt:
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Transcription timed out")
+                    segments = await asyncio.to_thread(_request, chunk_path, options, remaining)
+        except Exception as e:
+            raise TranscriptionError(f"Chunk {index} could not be transcribed: {e}") from e
+        finally:
+            os.remove(chunk_path)
+
+    def to_original(position_ms: float) -> float:
+        position_ms = position_ms * options.tempo + start_ms
+        return offset_map.to_original(position_ms) if offset_map else position_ms
+
+    segments = [(to_original(start), to_original(end), text.strip()) for start, end, text in segments]
+    return ChunkResult(
+        index=index,
+        start_ms=to_original(0),
+        end_ms=to_original((end_ms - start_ms) / options.tempo),
+        text=" ".join(text for _, _, text in segments if text),
+        segments=segments,
+    )
+
+
+async def transcribe_stream(
+    source: Source, options: Optional[TranscriptionOptions] = None
+) -> AsyncIterator[ChunkResult]:
+    """
+    Transcribe a recording and yield each chunk's transcript, in order, as it is ready.
+
+    Up to `options.max_concurrency` chunks are transcribed at once. Cancelling
+    the consuming task, or closing the iterator early, stops any outstanding
+    chunks and removes temporary files.
+
+    Args:
+        source (Source): Path to an audio file, or its contents as bytes.
+        options (Optional[TranscriptionOptions]): Settings for this transcription.
+
+    Yields:
+        ChunkResult: The transcript of the next chunk.
+
+    Raises:
+        TimeoutError: If `options.timeout` seconds pass before the last chunk is done.
+        TranscriptionError: If a chunk still fails after `options.max_attempts` attempts,
+            or at once if the provider rejects it as invalid.
+    """
+    options = options or TranscriptionOptions()
+    deadline = time.monotonic() + options.timeout if options.timeout else None
+
+    audio = await _within(asyncio.to_thread(_decode, source), deadline)
+    offset_map = None
+    silence = options.silence_compaction or {}
+    if silence.get("enabled", False):
+        audio, offset_map = await _within(
+            asyncio.to_thread(
+                compact_silence,
+                audio,
+                silence.get("min_silence_ms", 2000),
+                silence.get("threshold_db", -16.0),
+                silence.get("keep_silence_ms", 500),
+            ),
+            deadline,
+        )
+
+    if options.provider == "assemblyai":
+        ranges = [(0, len(audio))]
+    else:
+        chunk_ms = int(options.chunk_minutes * 60 * 1000 * options.tempo)
+        ranges = [(start, min(start + chunk_ms, len(audio))) for start in range(0, len(audio), chunk_ms)]
+
+    semaphore = asyncio.Semaphore(options.max_concurrency)
+    with tempfile.TemporaryDirectory(prefix="transcribe-me-") as workdir:
+        tasks = [
+            asyncio.ensure_future(
+                _transcribe_range(audio, index, start, end, workdir, options, offset_map, semaphore, deadline)
+            )
+            for index, (start, end) in enumerate(ranges)
+        ]
+        try:
+            for task in tasks:
+                yield await _within(task, deadline)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def transcribe(source: Source, options: Optional[TranscriptionOptions] = None) -> TranscriptionResult:
+    """
+    Transcribe a recording and return the full transcript.
+
+    Args:
+        source (Source): Path to an audio file, or its contents as bytes.
+        options (Optional[TranscriptionOptions]): Settings for this transcription.
+
+    Returns:
+        TranscriptionResult: The transcript and its chunks.
+
+    Raises:
+        TimeoutError: If `options.timeout` seconds pass before the transcript is done.
+        TranscriptionError: If a chunk still fails after `options.max_attempts` attempts.
+    """
+    chunks = [chunk async for chunk in transcribe_stream(source, options)]
+    return TranscriptionResult(text=" ".join(chunk.text for chunk in chunks if chunk.text), chunks=chunks)
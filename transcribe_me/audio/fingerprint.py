@@ -0,0 +1,311 @@
+import os
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+# Spectral fingerprint parameters. Each frame covers ~410 ms of audio and frames
+# start every 64 ms, so two copies of a recording that start at different times
+# still line up to within half a hop.
+SAMPLE_RATE = 5000
+FRAME_SIZE = 2048
+HOP_SIZE = 320
+BAND_EDGES = np.geomspace(300, 2000, 34)
+FRAMES_PER_BLOCK = 2048
+
+# Only every INDEX_STRIDE-th frame goes into the inverted index. Queries use
+# every frame, so any alignment still hits an indexed frame.
+INDEX_STRIDE = 8
+QUERY_BATCH = 500
+CANDIDATES = 3
+
+# Frames quieter than this RMS level, on a 16-bit sample scale, carry no
+# spectral information and get the SILENT sub-fingerprint, which is neither
+# indexed nor matched.
+SILENCE_RMS = 100.0
+SILENT = 0
+# Sub-fingerprints with more postings than this are too common to tell
+# recordings apart, so they are dropped from the index like stop words.
+MAX_POSTINGS = 1000
+
+
+@dataclass
+class FingerprintMatch:
+    """An indexed recording that overlaps a queried fingerprint."""
+
+    source_path: str
+    transcript_path: str
+    coverage: float
+    overlap_seconds: float
+    offset_seconds: float
+    bit_error_rate: float
+
+
+def _band_matrix() -> np.ndarray:
+    """Build a (bins, bands) matrix summing FFT power into log-spaced bands."""
+    freqs = np.fft.rfftfreq(FRAME_SIZE, d=1.0 / SAMPLE_RATE)
+    lower = BAND_EDGES[:-1, None]
+    upper = BAND_EDGES[1:, None]
+    return ((freqs >= lower) & (freqs < upper)).T.astype(np.float32)
+
+
+def fingerprint_samples(samples: np.ndarray) -> np.ndarray:
+    """
+    Compute 32-bit sub-fingerprints from mono samples at SAMPLE_RATE.
+
+    Each bit records whether the energy difference between two adjacent bands
+    rose or fell since the previous frame, which survives re-encoding at a
+    different bitrate and changes in volume. Sub-fingerprints that span a
+    frame quieter than SILENCE_RMS are set to SILENT.
+
+    Args:
+        samples (np.ndarray): Mono audio samples on a 16-bit scale.
+
+    Returns:
+        np.ndarray: One uint32 sub-fingerprint per frame.
+    """
+    if len(samples) < FRAME_SIZE + HOP_SIZE:
+        return np.zeros(0, dtype=np.uint32)
+
+    samples = samples.astype(np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    bands = _band_matrix()
+
+    energies = []
+    loudness = []
+    for start in range(0, len(frames), FRAMES_PER_BLOCK):
+        block = frames[start: start + FRAMES_PER_BLOCK]
+        loudness.append(np.sqrt(np.mean(block ** 2, axis=1)))
+        power = np.abs(np.fft.rfft(block * window, axis=1)) ** 2
+        energies.append(power @ bands)
+    energy = np.concatenate(energies)
+
+    band_delta = energy[:, :-1] - energy[:, 1:]
+    bits = (band_delta[1:] - band_delta[:-1]) > 0
+    weights = (1 << np.arange(32, dtype=np.uint64)).astype(np.uint64)
+    fingerprint = (bits.astype(np.uint64) @ weights).astype(np.uint32)
+
+    # Each sub-fingerprint compares a frame with the next, so both must be audible.
+    audible = np.concatenate(loudness) >= SILENCE_RMS
+    fingerprint[~(audible[1:] & audible[:-1])] = SILENT
+    return fingerprint
+
+
+def compute_fingerprint(file_path: str) -> np.ndarray:
+    """
+    Decode an audio file and compute its fingerprint.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        np.ndarray: One uint32 sub-fingerprint per frame.
+    """
+    audio = AudioSegment.from_file(file_path)
+    audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+    return fingerprint_samples(np.array(audio.get_array_of_samples()))
+
+
+def bit_error_rate(a: np.ndarray, b: np.ndarray) -> float:
+    """Return the fraction of differing bits between two equal-length fingerprints."""
+    if len(a) == 0:
+        return 1.0
+    differing = np.unpackbits(np.bitwise_xor(a, b).view(np.uint8)).sum()
+    return float(differing) / (len(a) * 32)
+
+
+def _indexed_frames(fingerprint: np.ndarray) -> list[tuple[int, int]]:
+    """Return the (value, frame) postings a fingerprint contributes to the index."""
+    frames = np.arange(0, len(fingerprint), INDEX_STRIDE)
+    frames = frames[fingerprint[frames] != SILENT]
+    return [(int(fingerprint[i]), int(i)) for i in frames]
+
+
+class FingerprintIndex:
+    """
+    Persistent inverted index of recording fingerprints, stored in SQLite.
+
+    Full fingerprints are kept per file for verification, while a strided
+    subset of sub-fingerprints is indexed by value so lookups stay fast as the
+    index grows to tens of thousands of recordings. Silent sub-fingerprints
+    are never indexed, and values with more than MAX_POSTINGS postings are
+    dropped, so no single value can make a lookup scan a large part of the index.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                transcript TEXT NOT NULL,
+                fingerprint BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS hashes (
+                hash INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                frame INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS hashes_by_value ON hashes (hash);
+            CREATE INDEX IF NOT EXISTS hashes_by_file ON hashes (file_id);
+            CREATE TABLE IF NOT EXISTS hash_counts (
+                hash INTEGER PRIMARY KEY,
+                postings INTEGER NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _common_hashes(self, values: list[int]) -> set[int]:
+        """Return the values among `values` that have more than MAX_POSTINGS postings."""
+        common = set()
+        for start in range(0, len(values), QUERY_BATCH):
+            batch = values[start: start + QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT hash FROM hash_counts WHERE hash IN ({placeholders}) AND postings > ?",
+                [*batch, MAX_POSTINGS],
+            )
+            common.update(value for value, in rows)
+        return common
+
+    def _delete(self, path: str) -> None:
+        row = self.connection.execute("SELECT id, fingerprint FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        previous = _indexed_frames(np.frombuffer(row[1], dtype=np.uint32))
+        self.connection.executemany(
+            "UPDATE hash_counts SET postings = postings - ? WHERE hash = ?",
+            ((count, value) for value, count in Counter(value for value, _ in previous).items()),
+        )
+        self.connection.execute("DELETE FROM hashes WHERE file_id = ?", (row[0],))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+    def remove(self, path: str) -> None:
+        """Drop the entry for a recording, if there is one."""
+        with self.connection:
+            self._delete(path)
+
+    def add(self, path: str, transcript_path: str, fingerprint: np.ndarray) -> None:
+        """
+        Index a recording, replacing any previous entry for the same path.
+
+        Args:
+            path (str): Path to the audio file.
+            transcript_path (str): Path to the transcript produced for it.
+            fingerprint (np.ndarray): Its fingerprint from `compute_fingerprint`.
+        """
+        with self.connection:
+            self._delete(path)
+            cursor = self.connection.execute(
+                "INSERT INTO files (path, transcript, fingerprint) VALUES (?, ?, ?)",
+                (path, transcript_path, fingerprint.astype(np.uint32).tobytes()),
+            )
+
+            indexed = _indexed_frames(fingerprint)
+            counts = Counter(value for value, _ in indexed)
+            self.connection.executemany(
+                "INSERT INTO hash_counts (hash, postings) VALUES (?, ?) "
+                "ON CONFLICT (hash) DO UPDATE SET postings = postings + excluded.postings",
+                counts.items(),
+            )
+            common = self._common_hashes(list(counts))
+            self.connection.executemany("DELETE FROM hashes WHERE hash = ?", ((value,) for value in common))
+            self.connection.executemany(
+                "INSERT INTO hashes (hash, file_id, frame) VALUES (?, ?, ?)",
+                ((value, cursor.lastrowid, frame) for value, frame in indexed if value not in common),
+            )
+
+    def _vote(self, fingerprint: np.ndarray) -> Counter:
+        """Count exact sub-fingerprint hits per (file id, frame offset) alignment."""
+        positions: dict[int, list[int]] = {}
+        for frame, value in enumerate(fingerprint.tolist()):
+            if value != SILENT:
+                positions.setdefault(value, []).append(frame)
+
+        votes: Counter = Counter()
+        common = self._common_hashes(list(positions))
+        values = [value for value, frames in positions.items() if len(frames) <= MAX_POSTINGS and value not in common]
+        for start in range(0, len(values), QUERY_BATCH):
+            batch = values[start: start + QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT hash, file_id, frame FROM hashes WHERE hash IN ({placeholders})", batch
+            )
+            for value, file_id, frame in rows:
+                for query_frame in positions[value]:
+                    votes[(file_id, frame - query_frame)] += 1
+        return votes
+
+    def lookup(
+        self, fingerprint: np.ndarray, max_bit_error_rate: float = 0.35, exclude_path: Optional[str] = None
+    ) -> Optional[FingerprintMatch]:
+        """
+        Find the indexed recording that best overlaps a fingerprint.
+
+        Candidate alignments are found by voting on exact sub-fingerprint hits,
+        then verified by the bit error rate over the overlapping span, leaving
+        out frames that are silent in both recordings. Coverage is the overlap
+        as a fraction of the longer of the two recordings, so an excerpt of a
+        longer recording is not mistaken for a copy of it.
+
+        Args:
+            fingerprint (np.ndarray): Fingerprint of the recording to look up.
+            max_bit_error_rate (float): Highest bit error rate accepted as a match.
+            exclude_path (Optional[str]): Path whose own entry is never returned, so a
+                recording that was indexed on an earlier, failed run does not match itself.
+
+        Returns:
+            Optional[FingerprintMatch]: The best match, or None if nothing overlaps.
+        """
+        if len(fingerprint) == 0:
+            return None
+
+        votes = self._vote(fingerprint)
+        if exclude_path is not None:
+            row = self.connection.execute("SELECT id FROM files WHERE path = ?", (exclude_path,)).fetchone()
+            for alignment in [alignment for alignment in votes if row and alignment[0] == row[0]]:
+                del votes[alignment]
+
+        best = None
+        for (file_id, offset), _ in votes.most_common(CANDIDATES):
+            path, transcript, blob = self.connection.execute(
+                "SELECT path, transcript, fingerprint FROM files WHERE id = ?", (file_id,)
+            ).fetchone()
+            stored = np.frombuffer(blob, dtype=np.uint32)
+            query_start = max(0, -offset)
+            stored_start = max(0, offset)
+            length = min(len(fingerprint) - query_start, len(stored) - stored_start)
+            if length <= 0:
+                continue
+
+            query = fingerprint[query_start: query_start + length]
+            other = stored[stored_start: stored_start + length]
+            informative = (query != SILENT) | (other != SILENT)
+            if not informative.any():
+                continue
+            error_rate = bit_error_rate(query[informative], other[informative])
+            if error_rate > max_bit_error_rate:
+                continue
+
+            match = FingerprintMatch(
+                source_path=path,
+                transcript_path=transcript,
+                coverage=length / max(len(fingerprint), len(stored)),
+                overlap_seconds=length * HOP_SIZE / SAMPLE_RATE,
+                offset_seconds=offset * HOP_SIZE / SAMPLE_RATE,
+                bit_error_rate=error_rate,
+            )
+            if best is None or match.coverage > best.coverage:
+                best = match
+        return best
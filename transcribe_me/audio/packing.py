@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+from pydub import AudioSegment
+
+from .splitting import load_audio
+
+PACK_BITRATE = "64k"
+PACK_BYTES_PER_MS = 64 * 1000 / 8 / 1000
+
+
+@dataclass
+class Clip:
+    """A short input file waiting to be packed."""
+
+    file_path: str
+    output_path: str
+    duration_ms: int
+
+
+def plan_packs(
+    clips: Iterable[Clip],
+    max_pack_ms: int = 600_000,
+    max_pack_bytes: int = 24 * 1024 * 1024,
+    separator_ms: int = 1500,
+) -> list[list[Clip]]:
+    """
+    Group clips, in order, into packs that stay under the duration and upload size limits.
+
+    Args:
+        clips (Iterable[Clip]): Clips to pack.
+        max_pack_ms (int): Longest pack, including separators.
+        max_pack_bytes (int): Largest pack upload at PACK_BITRATE.
+        separator_ms (int): Silence inserted between clips.
+
+    Returns:
+        list[list[Clip]]: The clips of each pack.
+    """
+    limit_ms = min(max_pack_ms, int(max_pack_bytes / PACK_BYTES_PER_MS))
+    packs: list[list[Clip]] = []
+    current: list[Clip] = []
+    current_ms = 0
+    for clip in clips:
+        added_ms = clip.duration_ms + (separator_ms if current else 0)
+        if current and current_ms + added_ms > limit_ms:
+            packs.append(current)
+            current, current_ms = [], 0
+            added_ms = clip.duration_ms
+        current.append(clip)
+        current_ms += added_ms
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_pack(clips: list[Clip], separator_ms: int = 1500) -> tuple[AudioSegment, list[tuple[int, int]]]:
+    """
+    Concatenate clips with silence between them.
+
+    Args:
+        clips (list[Clip]): Clips to concatenate.
+        separator_ms (int): Silence inserted between clips.
+
+    Returns:
+        tuple: The packed audio and the (start_ms, end_ms) span of each clip within it.
+    """
+    pieces = [load_audio(clip.file_path).set_channels(1).set_frame_rate(16000) for clip in clips]
+    separator = AudioSegment.silent(duration=separator_ms, frame_rate=16000)
+
+    spans = []
+    position = 0
+    raw = []
+    for i, piece in enumerate(pieces):
+        if i:
+            raw.append(separator.raw_data)
+            position += separator_ms
+        raw.append(piece.set_sample_width(separator.sample_width).raw_data)
+        spans.append((position, position + len(piece)))
+        position += len(piece)
+    return separator._spawn(b"".join(raw)), spans
+
+
+def split_segments(
+    segments: Iterable[tuple[float, float, str]], spans: list[tuple[int, int]]
+) -> list[str]:
+    """
+    Distribute timestamped transcript segments back to the clips they came from.
+
+    A segment belongs to the clip whose span contains its midpoint, or the
+    nearest clip if the midpoint falls in a separator.
+
+    Args:
+        segments (Iterable[tuple[float, float, str]]): (start_ms, end_ms, text) segments.
+        spans (list[tuple[int, int]]): Clip spans returned by `build_pack`.
+
+    Returns:
+        list[str]: The transcript of each clip.
+    """
+    texts: list[list[str]] = [[] for _ in spans]
+    for start, end, text in segments:
+        midpoint = (start + end) / 2
+        distances = [
+            0 if span_start <= midpoint < span_end else min(abs(midpoint - span_start), abs(midpoint - span_end))
+            for span_start, span_end in spans
+        ]
+        texts[distances.index(min(distances))].append(text.strip())
+    return [" ".join(part for part in parts if part) for parts in texts]
@@ -0,0 +1,133 @@
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from colorama import Fore
+
+from .packing import Clip, PACK_BYTES_PER_MS, plan_packs
+from .probing import probe_durations
+from .report import format_duration
+from .routing import DEFAULT_LATENCY
+from .stats import LatencyStats
+from .tempo import resolve_tempo
+
+CHUNK_MINUTES = 10
+# split_audio exports chunks with ffmpeg's default MP3 bitrate of 128 kbps.
+CHUNK_BYTES_PER_SECOND = 128 * 1000 / 8
+
+
+@dataclass
+class Plan:
+    """Predicted cost of transcribing the pending files."""
+
+    provider: str
+    files: int
+    audio_seconds: float
+    chunks: int
+    upload_bytes: int
+    requests: int
+    work_seconds: float
+    longest_file_seconds: float
+    latency_basis: int
+    unreadable: int = 0
+
+    def wall_seconds(self, concurrency: int = 1, requests_per_minute: Optional[float] = None) -> float:
+        """
+        Estimate wall time at a given concurrency and provider rate limit.
+
+        The estimate is the largest of: the total request time spread over
+        `concurrency` workers, the time the rate limit needs to admit every
+        request, and the slowest single file, whose chunks run one after another.
+        """
+        estimate = max(self.work_seconds / max(concurrency, 1), self.longest_file_seconds)
+        if requests_per_minute:
+            estimate = max(estimate, self.requests / requests_per_minute * 60)
+        return estimate
+
+
+def build_plan(pending: list[tuple[str, str]], config: Dict[str, Any], stats: Optional[LatencyStats] = None) -> Plan:
+    """
+    Predict chunks, upload size, requests and request time for pending files without decoding them.
+
+    Durations come from container metadata via ffprobe. Latency comes from
+    previous runs when `stats` has samples for the provider.
+
+    Args:
+        pending (list[tuple[str, str]]): Pairs of (audio file path, output transcription path).
+        config (Dict[str, Any]): Configuration dictionary.
+        stats (Optional[LatencyStats]): Latencies observed in previous runs.
+
+    Returns:
+        Plan: The prediction.
+    """
+    provider = "assemblyai" if config.get("use_assemblyai", False) else "openai"
+    stats = stats or LatencyStats()
+    latency = stats.seconds_per_audio_second(provider) or DEFAULT_LATENCY[provider]
+    durations = probe_durations([file_path for file_path, _ in pending])
+
+    plan = Plan(provider, len(pending), sum(durations), 0, 0, 0, 0.0, 0.0, stats.requests(provider))
+    plan.unreadable = sum(1 for duration in durations if duration <= 0)
+
+    packing = config.get("packing") or {}
+    individual = list(zip(pending, durations))
+    if packing.get("enabled", False):
+        max_clip_seconds = packing.get("max_clip_seconds", 120)
+        clips = [
+            Clip(file_path, output_path, int(duration * 1000))
+            for (file_path, output_path), duration in individual
+            if 0 < duration <= max_clip_seconds
+        ]
+        packs = plan_packs(
+            clips,
+            max_pack_ms=packing.get("max_pack_seconds", 600) * 1000,
+            max_pack_bytes=packing.get("max_pack_bytes", 24 * 1024 * 1024),
+            separator_ms=packing.get("separator_ms", 1500),
+        )
+        packed = {clip.file_path for pack in packs if len(pack) > 1 for clip in pack}
+        individual = [job for job in individual if job[0][0] not in packed]
+        for pack in packs:
+            if len(pack) > 1:
+                pack_ms = sum(clip.duration_ms for clip in pack)
+                plan.chunks += 1
+                plan.requests += 1
+                plan.upload_bytes += int(pack_ms * PACK_BYTES_PER_MS)
+                plan.work_seconds += latency * pack_ms / 1000
+
+    for (file_path, _), duration in individual:
+        if provider == "assemblyai":
+            chunks = 1
+            upload_bytes = os.path.getsize(file_path)
+        else:
+            tempo = resolve_tempo(file_path, config)
+            chunks = max(math.ceil(duration / (CHUNK_MINUTES * 60 * tempo)), 1)
+            duration /= tempo
+            upload_bytes = int(duration * CHUNK_BYTES_PER_SECOND)
+        plan.chunks += chunks
+        plan.requests += chunks
+        plan.upload_bytes += upload_bytes
+        plan.work_seconds += latency * duration
+        plan.longest_file_seconds = max(plan.longest_file_seconds, latency * duration)
+    return plan
+
+
+def print_plan(plan: Plan, concurrency: int = 1, requests_per_minute: Optional[float] = None) -> None:
+    """Print a plan and its wall time estimate."""
+    rate = f", {requests_per_minute:g} requests/min" if requests_per_minute else ""
+    basis = (
+        f"{plan.latency_basis} previous requests"
+        if plan.latency_basis
+        else "default latency, no previous runs recorded"
+    )
+    print(f"{Fore.CYAN}Plan for {plan.files} files with {plan.provider}:")
+    print(f"{Fore.CYAN}  Audio: {format_duration(plan.audio_seconds * 1000)}")
+    print(f"{Fore.CYAN}  Chunks: {plan.chunks}")
+    print(f"{Fore.CYAN}  Upload: {plan.upload_bytes / 1e6:.1f} MB")
+    print(f"{Fore.CYAN}  Provider requests: {plan.requests}")
+    print(
+        f"{Fore.CYAN}  Estimated wall time: "
+        f"{format_duration(plan.wall_seconds(concurrency, requests_per_minute) * 1000)} "
+        f"at concurrency {concurrency}{rate} (based on {basis})"
+    )
+    if plan.unreadable:
+        print(f"{Fore.YELLOW}  {plan.unreadable} files could not be probed and are counted as empty")
@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pydub.utils import mediainfo
+
+PROBE_WORKERS = 16
+
+
+@lru_cache(maxsize=4096)
+def _probe(file_path: str, mtime: float, size: int) -> float:
+    try:
+        return float(mediainfo(file_path).get("duration", 0.0))
+    except (ValueError, TypeError, OSError):
+        return 0.0
+
+
+def probe_duration(file_path: str) -> float:
+    """
+    Read the duration of an audio file from its container metadata.
+
+    This shells out to ffprobe and does not decode the audio, so it is cheap
+    enough to call for every pending input. Results are cached until the file
+    changes.
+
+    Args:
+        file_path (str): Path to the audio file to probe.
+
+    Returns:
+        float: Duration in seconds, or 0.0 if it could not be determined.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return 0.0
+    return _probe(file_path, stat.st_mtime, stat.st_size)
+
+
+def probe_durations(file_paths: list[str]) -> list[float]:
+    """
+    Probe many files concurrently.
+
+    Args:
+        file_paths (list[str]): Paths to the audio files to probe.
+
+    Returns:
+        list[float]: Durations in seconds, in the same order as `file_paths`.
+    """
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        return list(executor.map(probe_duration, file_paths))
@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, Any, Optional
+from colorama import Fore
+
+
+def format_duration(milliseconds: float) -> str:
+    minutes, seconds = divmod(int(milliseconds // 1000), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    return f"{minutes}m {seconds}s"
+
+
+def _file_notes(stats: Dict[str, Any]) -> list[str]:
+    """Describe what happened to one file, from the statistics recorded for it."""
+    notes = []
+    original_ms = stats.get("original_ms", 0)
+    removed_ms = stats.get("silence_removed_ms")
+    if original_ms and removed_ms is not None:
+        notes.append(
+            f"silence removed {removed_ms / original_ms:.1%} "
+            f"({format_duration(removed_ms)} of {format_duration(original_ms)})"
+        )
+    if stats.get("tempo_saved_ms"):
+        notes.append(f"tempo saved {format_duration(stats['tempo_saved_ms'])}")
+    if "packed_with" in stats:
+        notes.append(f"packed with {stats['packed_with'] - 1} other clips")
+    if "failed" in stats:
+        moved = f", moved to {stats['dead_letter']}" if "dead_letter" in stats else ""
+        notes.append(f"failed ({stats['failed']}){moved}")
+    return notes
+
+
+class RunReport:
+    """
+    Collect per-file statistics during a run and print them as a summary.
+
+    Recording is thread-safe so concurrent transcriptions can share a report.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.requests: list[tuple[str, float, Optional[float]]] = []
+        self._lock = threading.Lock()
+
+    def record(self, file_path: str, **stats: Any) -> None:
+        """Merge `stats` into the entry for `file_path`."""
+        with self._lock:
+            self.files.setdefault(file_path, {}).update(stats)
+
+    def record_request(self, provider: str, seconds: float, audio_seconds: Optional[float] = None) -> None:
+        """Note the latency of one provider request and how much audio it carried."""
+        with self._lock:
+            self.requests.append((provider, seconds, audio_seconds))
+
+    def print_summary(self) -> None:
+        """Print one line per file that recorded statistics, then the totals."""
+        if not self.files:
+            return
+
+        print(f"{Fore.CYAN}Run report:")
+        for file_path, stats in self.files.items():
+            notes = _file_notes(stats)
+            if notes:
+                print(f"{Fore.CYAN}  {file_path}: {', '.join(notes)}")
+
+        files = list(self.files.values())
+        compacted = [stats for stats in files if stats.get("original_ms") and stats.get("silence_removed_ms") is not None]
+        original_total = sum(stats["original_ms"] for stats in compacted)
+        removed_total = sum(stats["silence_removed_ms"] for stats in compacted)
+        tempo_total = sum(stats.get("tempo_saved_ms", 0) for stats in files)
+        packed_total = sum("packed_with" in stats for stats in files)
+        failed_total = sum("failed" in stats for stats in files)
+        dead_letter_total = sum("failed" in stats and "dead_letter" in stats for stats in files)
+
+        if original_total:
+            print(
+                f"{Fore.CYAN}  Total: silence removed {removed_total / original_total:.1%} "
+                f"({format_duration(removed_total)} of {format_duration(original_total)})"
+            )
+        if tempo_total:
+            print(f"{Fore.CYAN}  Total: tempo saved {format_duration(tempo_total)}")
+        if packed_total:
+            print(f"{Fore.CYAN}  Total: {packed_total} clips transcribed in packs")
+        if failed_total:
+            print(
+                f"{Fore.RED}  Total: {failed_total} files failed, "
+                f"{dead_letter_total} moved to the dead-letter folder"
+            )
@@ -0,0 +1,227 @@
+import datetime
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from typing import Dict, Any, Optional
+
+from colorama import Fore
+from pydub.exceptions import CouldntDecodeError
+from tenacity import Retrying, retry_if_exception, wait_exponential
+
+# Transient failures, retried up to their class's budget.
+RATE_LIMIT = "rate_limit"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+UNKNOWN = "unknown"
+# Failures caused by the input itself. The input is moved to the dead-letter folder.
+INVALID_INPUT = "invalid_input"
+# Failures caused by the account or configuration, such as a bad API key.
+REJECTED = "rejected"
+
+PERMANENT_CLASSES = (INVALID_INPUT, REJECTED)
+DEFAULT_BUDGETS = {RATE_LIMIT: 8, SERVER_ERROR: 4, TIMEOUT: 4, UNKNOWN: 2}
+DEFAULT_FILE_DEADLINE_SECONDS = 3600
+DEFAULT_DEAD_LETTER_FOLDER = "dead-letter"
+INVALID_INPUT_STATUSES = (400, 413, 415, 422)
+# Fragments of the messages providers put in a failed transcript, rather than in an HTTP status.
+INVALID_INPUT_MESSAGES = (
+    "does not appear to contain audio",
+    "transcoding failed",
+    "unsupported",
+    "could not be decoded",
+    "file is empty",
+    "audio duration",
+    "too short",
+    "download error",
+)
+REJECTED_MESSAGES = ("api key", "authentication", "unauthorized", "permission", "account balance", "billing")
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for source in (error, getattr(error, "response", None)):
+        code = getattr(source, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+class TranscriptFailedError(RuntimeError):
+    """Raised when a provider accepted a request but reported the transcript as failed."""
+
+    def __init__(self, message: str, error_class: str = UNKNOWN):
+        super().__init__(message)
+        self.error_class = error_class
+
+
+def transcript_failed(message: Optional[str]) -> TranscriptFailedError:
+    """
+    Build the error for a failed transcript, classified by the provider's message.
+
+    AssemblyAI reports unusable audio and account problems in the transcript
+    itself, so the message is the only way to tell them from transient errors.
+    """
+    message = message or "Transcription failed"
+    lowered = message.lower()
+    if any(fragment in lowered for fragment in INVALID_INPUT_MESSAGES):
+        return TranscriptFailedError(message, INVALID_INPUT)
+    if any(fragment in lowered for fragment in REJECTED_MESSAGES):
+        return TranscriptFailedError(message, REJECTED)
+    return TranscriptFailedError(message)
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Decide whether a failed request is worth retrying, and why.
+
+    HTTP status codes are used when the provider SDK exposes them. Otherwise
+    the exception type is used, by name for provider exceptions so neither
+    SDK has to be installed. Errors that cannot be classified are looked up
+    through their cause before falling back to `UNKNOWN`.
+
+    Args:
+        error (BaseException): The exception raised by the request.
+
+    Returns:
+        str: One of the error classes defined in this module.
+    """
+    code = _status_code(error)
+    if code == 429:
+        return RATE_LIMIT
+    if code is not None and (code >= 500 or code in (408, 409)):
+        return SERVER_ERROR
+    if code in INVALID_INPUT_STATUSES:
+        return INVALID_INPUT
+    if code is not None and 400 <= code < 500:
+        return REJECTED
+
+    if isinstance(error, TranscriptFailedError) and error.error_class != UNKNOWN:
+        return error.error_class
+    if isinstance(error, CouldntDecodeError):
+        return INVALID_INPUT
+    names = [cls.__name__ for cls in type(error).__mro__]
+    if "RateLimitError" in names:
+        return RATE_LIMIT
+    if isinstance(error, (TimeoutError, ConnectionError)) or any(
+        "Timeout" in name or "Connection" in name for name in names
+    ):
+        return TIMEOUT
+
+    cause = error.__cause__ or error.__context__
+    if cause is not None and cause is not error:
+        return classify_error(cause)
+    return UNKNOWN
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for errors worth retrying. Cancellation and interrupts never are."""
+    return isinstance(error, Exception) and classify_error(error) not in PERMANENT_CLASSES
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a file's deadline passes before it has been transcribed."""
+
+
+class RetryPolicy:
+    """
+    Retry budgets per error class and an overall deadline for one input file.
+
+    Create one policy per file and pass it to every request for that file.
+    Each request gets its own budgets, while the deadline is shared, so a file
+    with many chunks cannot retry for longer than the deadline in total.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, deadline_seconds: Optional[float] = None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self._wait = wait_exponential(multiplier=1, min=4, max=60)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        """Build a policy from the `retry` section, starting the file's deadline now."""
+        options = (config or {}).get("retry") or {}
+        budgets = {name: options[name] for name in DEFAULT_BUDGETS if name in options}
+        return cls(budgets, options.get("file_deadline_seconds", DEFAULT_FILE_DEADLINE_SECONDS))
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None if there is none."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        """Return True once the deadline has passed."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check_deadline(self, file_path: str) -> None:
+        """Raise DeadlineExceededError if the deadline has passed."""
+        if self.expired():
+            raise DeadlineExceededError(f"Deadline passed before {file_path} was transcribed")
+
+    def retrying(self, file_path: str) -> Retrying:
+        """
+        Build a tenacity retry loop for one request.
+
+        Permanent errors are raised at once. Transient errors are retried with
+        exponential backoff until their class's budget is spent, or until the
+        next wait would run past the deadline.
+        """
+        attempts: Counter = Counter()
+
+        def stop(retry_state: Any) -> bool:
+            kind = classify_error(retry_state.outcome.exception())
+            attempts[kind] += 1
+            if attempts[kind] > self.budgets.get(kind, 0):
+                return True
+            remaining = self.remaining()
+            return remaining is not None and self._wait(retry_state) >= remaining
+
+        def before_sleep(retry_state: Any) -> None:
+            error = retry_state.outcome.exception()
+            print(
+                f"{Fore.YELLOW}{classify_error(error).replace('_', ' ').capitalize()} on {file_path}, "
+                f"retrying in {retry_state.next_action.sleep:.0f}s: {error}"
+            )
+
+        return Retrying(
+            retry=retry_if_exception(is_retryable),
+            stop=stop,
+            wait=self._wait,
+            before_sleep=before_sleep,
+            reraise=True,
+        )
+
+
+def dead_letter(file_path: str, error: BaseException, folder: str = DEFAULT_DEAD_LETTER_FOLDER) -> str:
+    """
+    Move a permanently failed input into the dead-letter folder and record why.
+
+    The error is written to `<file>.error.json` beside the moved file, so the
+    input can be fixed and moved back into the input folder.
+
+    Args:
+        file_path (str): Path to the input file.
+        error (BaseException): The error that failed it.
+        folder (str): Dead-letter folder.
+
+    Returns:
+        str: The new path of the input file.
+    """
+    os.makedirs(folder, exist_ok=True)
+    destination = os.path.join(folder, os.path.basename(file_path))
+    shutil.move(file_path, destination)
+    with open(f"{destination}.error.json", "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "file": file_path,
+                "class": classify_error(error),
+                "type": type(error).__name__,
+                "error": str(error),
+                "failed_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            },
+            file,
+            indent=2,
+        )
+    return destination
@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from .stats import LatencyStats
+
+PROVIDERS = ("openai", "assemblyai")
+
+# Seconds of wall time per second of audio, used until real samples arrive.
+DEFAULT_LATENCY = {"openai": 0.1, "assemblyai": 0.1}
+DEFAULT_MAX_CONCURRENCY = 2
+EWMA_ALPHA = 0.3
+
+
+class CircuitBreaker:
+    """
+    Stop sending work to a provider after repeated failures.
+
+    The breaker opens after `failure_threshold` consecutive failures and lets a
+    single trial request through once `reset_seconds` have passed. A success
+    closes it again; a failed trial re-opens it for another full period.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        if self.trial_in_flight:
+            return True
+        return time.monotonic() - self.opened_at < self.reset_seconds
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent, claiming the trial slot when half-open."""
+        if self.opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+
+class ProviderState:
+    """Live load, latency and error statistics for a single provider."""
+
+    def __init__(self, name: str, max_concurrency: int, breaker: CircuitBreaker, latency: Optional[float] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self.in_flight = 0
+        self.latency = latency or DEFAULT_LATENCY.get(name, 0.1)
+        self.error_rate = 0.0
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.max_concurrency
+
+    def estimate(self, duration: float) -> float:
+        """
+        Estimate seconds until a file of `duration` seconds would be transcribed.
+
+        The estimate grows with queue depth relative to the concurrency cap and
+        is inflated by the observed error rate, since failed work is retried.
+        """
+        service_time = self.latency * max(duration, 1.0)
+        load = 1.0 + self.in_flight / self.max_concurrency
+        return service_time * load / max(1.0 - self.error_rate, 0.05)
+
+    def observe(self, duration: float, elapsed: float, ok: bool) -> None:
+        if ok and duration > 0:
+            sample = elapsed / duration
+            self.latency = EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * self.latency
+        self.error_rate = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+
+
+class ProviderRouter:
+    """
+    Assign files to providers based on duration, queue depth, latency and errors.
+
+    Each provider has its own concurrency cap and circuit breaker. Callers
+    `acquire` a provider for a file, which blocks until one has a free slot, and
+    must `release` it with the outcome once the transcription finishes.
+    Latency estimates start from `stats` gathered in previous runs, if given.
+    """
+
+    def __init__(self, config: Dict[str, Any], stats: Optional[LatencyStats] = None):
+        routing = config.get("routing", {}) or {}
+        threshold = routing.get("failure_threshold", 3)
+        reset_seconds = routing.get("reset_seconds", 60)
+        self.providers: Dict[str, ProviderState] = {}
+        for name in PROVIDERS:
+            limits = routing.get(name, {}) or {}
+            self.providers[name] = ProviderState(
+                name,
+                limits.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+                CircuitBreaker(threshold, reset_seconds),
+                stats.seconds_per_audio_second(name) if stats else None,
+            )
+        self._condition = threading.Condition()
+
+    @property
+    def total_concurrency(self) -> int:
+        return sum(state.max_concurrency for state in self.providers.values())
+
+    def _available(self, exclude: Tuple[str, ...]) -> list[ProviderState]:
+        return [
+            state
+            for name, state in self.providers.items()
+            if name not in exclude and not state.breaker.is_open
+        ]
+
+    def acquire(self, duration: float, exclude: Tuple[str, ...] = ()) -> Optional[str]:
+        """
+        Reserve a slot on the provider expected to finish `duration` seconds of audio soonest.
+
+        Args:
+            duration (float): Duration of the file in seconds.
+            exclude (tuple): Provider names that must not be chosen.
+
+        Returns:
+            Optional[str]: The chosen provider, or None if every candidate's breaker is open.
+        """
+        with self._condition:
+            while True:
+                candidates = self._available(exclude)
+                if not candidates:
+                    return None
+                ready = [state for state in candidates if state.has_capacity]
+                if ready:
+                    best = min(ready, key=lambda state: state.estimate(duration))
+                    if best.breaker.allow():
+                        best.in_flight += 1
+                        return best.name
+                self._condition.wait(timeout=1.0)
+
+    def release(self, provider: str, duration: float, elapsed: float, ok: bool, observe: bool = True) -> None:
+        """
+        Return a slot to `provider` and record the outcome of the request.
+
+        Pass `observe=False` for failures that say nothing about the provider's
+        health, such as an input that could not be decoded.
+        """
+        with self._condition:
+            state = self.providers[provider]
+            state.in_flight -= 1
+            if not observe:
+                state.breaker.trial_in_flight = False
+            elif ok:
+                state.observe(duration, elapsed, ok)
+                state.breaker.record_success()
+            else:
+                state.observe(duration, elapsed, ok)
+                state.breaker.record_failure()
+            self._condition.notify_all()
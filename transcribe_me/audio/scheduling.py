@@ -0,0 +1,169 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import Dict, Any, Optional
+
+from ..config.config_manager import DEFAULT_STATE_FOLDER
+from .probing import probe_durations
+
+POLICIES = ("fifo", "shortest_first", "oldest_first", "priority")
+DEFAULT_AGING_RATE = 0.1
+DEFAULT_MAX_AGING_HOURS = 24.0
+DEFAULT_QUEUE_FILE = os.path.join(DEFAULT_STATE_FOLDER, "queue.json")
+
+
+@dataclass
+class Job:
+    """A pending input file and what the scheduler knows about it."""
+
+    file_path: str
+    output_path: str
+    duration: float = 0.0
+    submitted_at: float = 0.0
+    priority: int = 0
+
+
+def read_priority(file_path: str, patterns: Optional[Dict[str, int]] = None) -> int:
+    """
+    Look up the explicit priority of an input file.
+
+    A `<file>.priority` sidecar containing an integer takes precedence. Otherwise
+    the highest priority among the filename patterns that match is used.
+
+    Args:
+        file_path (str): Path to the audio file.
+        patterns (Optional[Dict[str, int]]): Glob patterns on the file name mapped to priorities.
+
+    Returns:
+        int: The priority, where higher runs sooner. Defaults to 0.
+    """
+    sidecar = f"{file_path}.priority"
+    if os.path.exists(sidecar):
+        try:
+            with open(sidecar, "r", encoding="utf-8") as file:
+                return int(file.read().strip())
+        except ValueError:
+            pass
+
+    name = os.path.basename(file_path)
+    matches = [priority for pattern, priority in (patterns or {}).items() if fnmatch(name, pattern)]
+    return max(matches, default=0)
+
+
+def first_seen(paths: list[str], queue_path: str = DEFAULT_QUEUE_FILE, now: Optional[float] = None) -> Dict[str, float]:
+    """
+    Look up when each pending file was first seen, recording any new ones.
+
+    Modification times are not used because copies and downloads often keep
+    the mtime of the original, which can predate the file being queued by
+    months. A file found for the first time is instead stamped with its status
+    change time (`st_ctime`), or now if that is later, and keeps that stamp on
+    every later run. Entries for files that are no longer pending are dropped.
+
+    Args:
+        paths (list[str]): Paths of the pending audio files.
+        queue_path (str): JSON file the timestamps are persisted in.
+        now (Optional[float]): Current time as a Unix timestamp.
+
+    Returns:
+        Dict[str, float]: Each path mapped to the Unix timestamp it was first seen.
+    """
+    now = now or time.time()
+    known: Dict[str, float] = {}
+    if os.path.exists(queue_path):
+        try:
+            with open(queue_path, "r", encoding="utf-8") as file:
+                known = json.load(file)
+        except (OSError, ValueError):
+            known = {}
+
+    seen = {}
+    for path in paths:
+        if path in known:
+            seen[path] = known[path]
+        else:
+            try:
+                seen[path] = min(os.stat(path).st_ctime, now)
+            except OSError:
+                seen[path] = now
+
+    directory = os.path.dirname(queue_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(queue_path, "w", encoding="utf-8") as file:
+        json.dump(seen, file, indent=2)
+    return seen
+
+
+def job_score(
+    job: Job,
+    policy: str,
+    aging_rate: float = DEFAULT_AGING_RATE,
+    now: Optional[float] = None,
+    max_aging_hours: float = DEFAULT_MAX_AGING_HOURS,
+) -> tuple:
+    """
+    Compute the sort key of a job under a scheduling policy. Lower runs sooner.
+
+    Aging keeps long or low-priority jobs from starving: for every hour a file
+    has waited, its effective duration shrinks by a factor of `1 + aging_rate`
+    under `shortest_first`, and its priority grows by `aging_rate` under
+    `priority`. Waiting time counts from when the file was first seen (see
+    `first_seen`) and stops counting after `max_aging_hours`, so a file with a
+    wrong or very old timestamp can only gain a bounded boost.
+
+    Args:
+        job (Job): The job to score.
+        policy (str): One of POLICIES.
+        aging_rate (float): How quickly waiting jobs move up the queue.
+        now (Optional[float]): Current time as a Unix timestamp.
+        max_aging_hours (float): Waiting time beyond which a job ages no further.
+
+    Returns:
+        tuple: The sort key.
+    """
+    waited_hours = min(max((now or time.time()) - job.submitted_at, 0) / 3600, max_aging_hours)
+    if policy == "shortest_first":
+        return (job.duration / (1 + aging_rate * waited_hours),)
+    if policy == "oldest_first":
+        return (job.submitted_at,)
+    if policy == "priority":
+        return (-(job.priority + aging_rate * waited_hours), job.duration)
+    return ()
+
+
+def order_jobs(pending: list[tuple[str, str]], config: Dict[str, Any]) -> list[tuple[str, str]]:
+    """
+    Order pending files according to the configured scheduling policy.
+
+    Args:
+        pending (list[tuple[str, str]]): Pairs of (audio file path, output transcription path).
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        list[tuple[str, str]]: The same pairs in the order they should be processed.
+    """
+    options = config.get("scheduling") or {}
+    policy = options.get("policy", "fifo")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy '{policy}', expected one of {', '.join(POLICIES)}")
+    if policy == "fifo":
+        return list(pending)
+
+    now = time.time()
+    jobs = [Job(file_path, output_path) for file_path, output_path in pending]
+    seen = first_seen([job.file_path for job in jobs], options.get("queue_path", DEFAULT_QUEUE_FILE), now)
+    for job in jobs:
+        job.submitted_at = seen[job.file_path]
+        if policy == "priority":
+            job.priority = read_priority(job.file_path, options.get("priority_patterns"))
+    if policy in ("shortest_first", "priority"):
+        for job, duration in zip(jobs, probe_durations([job.file_path for job in jobs])):
+            job.duration = duration
+
+    aging_rate = options.get("aging_rate", DEFAULT_AGING_RATE)
+    max_aging_hours = options.get("max_aging_hours", DEFAULT_MAX_AGING_HOURS)
+    jobs.sort(key=lambda job: job_score(job, policy, aging_rate, now, max_aging_hours))
+    return [(job.file_path, job.output_path) for job in jobs]
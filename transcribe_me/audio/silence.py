@@ -0,0 +1,164 @@
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+import numpy as np
+from pydub import AudioSegment
+
+WINDOW_MS = 10
+# Windows analysed per block, so only a minute of audio is ever held as floats.
+BLOCK_WINDOWS = 6000
+SAMPLE_TYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+@dataclass
+class OffsetMap:
+    """
+    Map positions in compacted audio back to the original recording.
+
+    Each segment is a (compacted_start_ms, original_start_ms, length_ms) triple
+    for a stretch of audio that was kept. When the compacted audio was also
+    sped up by `tempo` before upload, uploaded positions are stretched back by
+    that factor first.
+    """
+
+    original_ms: int
+    segments: list[tuple[int, int, int]] = field(default_factory=list)
+    tempo: float = 1.0
+
+    @classmethod
+    def identity(cls, length_ms: int, tempo: float = 1.0) -> "OffsetMap":
+        """Build a map for audio that was not compacted, only sped up."""
+        return cls(length_ms, [(0, 0, length_ms)], tempo)
+
+    @property
+    def compacted_ms(self) -> int:
+        return sum(length for _, _, length in self.segments)
+
+    @property
+    def removed_ratio(self) -> float:
+        if not self.original_ms:
+            return 0.0
+        return 1.0 - self.compacted_ms / self.original_ms
+
+    def to_original(self, position_ms: float) -> float:
+        """
+        Translate a timestamp in the uploaded audio to the original timeline.
+
+        Args:
+            position_ms (float): Milliseconds from the start of the uploaded audio.
+
+        Returns:
+            float: Milliseconds from the start of the original recording.
+        """
+        position_ms *= self.tempo
+        if not self.segments:
+            return position_ms
+        starts = [start for start, _, _ in self.segments]
+        index = max(bisect_right(starts, position_ms) - 1, 0)
+        compacted_start, original_start, _ = self.segments[index]
+        return original_start + (position_ms - compacted_start)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"original_ms": self.original_ms, "segments": self.segments, "tempo": self.tempo}, file)
+
+    @classmethod
+    def load(cls, path: str) -> "OffsetMap":
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(data["original_ms"], [tuple(segment) for segment in data["segments"]], data.get("tempo", 1.0))
+
+
+def detect_silence_spans(
+    audio: AudioSegment, min_silence_ms: int = 2000, threshold_db: float = -16.0
+) -> list[tuple[int, int]]:
+    """
+    Find stretches of silence using windowed RMS energy.
+
+    The samples are read in place from the decoded audio and converted to
+    float32 one block of windows at a time, so hour-long recordings need no
+    more than a small working copy on top of the decoded audio.
+
+    Args:
+        audio (AudioSegment): Audio to analyse.
+        min_silence_ms (int): Shortest stretch of silence to report.
+        threshold_db (float): Loudness, relative to the recording's average, below which audio counts as silent.
+
+    Returns:
+        list[tuple[int, int]]: (start_ms, end_ms) pairs of silent spans.
+    """
+    if audio.rms == 0:
+        return [(0, len(audio))] if len(audio) >= min_silence_ms else []
+
+    if audio.sample_width in SAMPLE_TYPES:
+        samples = np.frombuffer(audio.raw_data, dtype=SAMPLE_TYPES[audio.sample_width])
+    else:
+        samples = np.array(audio.get_array_of_samples())
+    window = max(audio.frame_rate * WINDOW_MS // 1000, 1)
+    windows = len(samples) // (window * audio.channels)
+    if windows == 0:
+        return []
+
+    frames = samples[: windows * window * audio.channels].reshape(windows, window, audio.channels)
+    power = np.empty(windows, dtype=np.float32)
+    for start in range(0, windows, BLOCK_WINDOWS):
+        block = frames[start: start + BLOCK_WINDOWS].astype(np.float32).mean(axis=2)
+        power[start: start + BLOCK_WINDOWS] = np.square(block).mean(axis=1)
+    rms_db = 10 * np.log10(np.maximum(power, 1e-10) / audio.max_possible_amplitude ** 2)
+    silent = rms_db < audio.dBFS + threshold_db
+
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    long_enough = (ends - starts) * WINDOW_MS >= min_silence_ms
+    return [
+        (int(start) * WINDOW_MS, min(int(end) * WINDOW_MS, len(audio)))
+        for start, end in zip(starts[long_enough], ends[long_enough])
+    ]
+
+
+def compact_silence(
+    audio: AudioSegment,
+    min_silence_ms: int = 2000,
+    threshold_db: float = -16.0,
+    keep_silence_ms: int = 500,
+) -> tuple[AudioSegment, OffsetMap]:
+    """
+    Shorten long silences so less audio is uploaded and billed.
+
+    Every silent span of at least `min_silence_ms` is cut down to
+    `keep_silence_ms`, split evenly between its two ends so words are not
+    clipped.
+
+    Args:
+        audio (AudioSegment): Audio to compact.
+        min_silence_ms (int): Shortest stretch of silence to shorten.
+        threshold_db (float): Loudness, relative to the recording's average, below which audio counts as silent.
+        keep_silence_ms (int): How much of each silent span to keep.
+
+    Returns:
+        tuple[AudioSegment, OffsetMap]: The compacted audio and the map back to the original timeline.
+    """
+    offset_map = OffsetMap(len(audio))
+    kept = []
+    position = 0
+    head = keep_silence_ms // 2
+    tail = keep_silence_ms - head
+    for start, end in detect_silence_spans(audio, max(min_silence_ms, keep_silence_ms), threshold_db):
+        if start + head > position:
+            kept.append((position, start + head))
+        position = end - tail
+    if position < len(audio):
+        kept.append((position, len(audio)))
+
+    pieces = []
+    compacted_position = 0
+    for start, end in kept:
+        first = int(start * audio.frame_rate / 1000) * audio.frame_width
+        last = int(end * audio.frame_rate / 1000) * audio.frame_width
+        pieces.append(audio.raw_data[first:last])
+        offset_map.segments.append((compacted_position, start, end - start))
+        compacted_position += end - start
+
+    return audio._spawn(b"".join(pieces)), offset_map
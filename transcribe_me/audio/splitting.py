@@ -2,25 +2,46 @@ import os
 from pydub import AudioSegment
 from halo import Halo
 
+from .tempo import tempo_parameters
 
-def split_audio(file_path: str, interval_minutes: int = 10) -> list[str]:
+
+def load_audio(file_path: str) -> AudioSegment:
     """
-    Split an audio file into chunks of a specified length.
+    Decode an MP3 or M4A file.
 
     Args:
-        file_path (str): Path to the audio file to split.
-        interval_minutes (int): Length of each chunk in minutes.
+        file_path (str): Path to the audio file.
 
     Returns:
-        list[str]: List of file paths for the generated chunks.
+        AudioSegment: The decoded audio.
     """
     extension = os.path.splitext(file_path)[1]
     if extension == ".m4a":
-        audio = AudioSegment.from_file(file_path, format="m4a")
-    else:
-        audio = AudioSegment.from_mp3(file_path)
+        return AudioSegment.from_file(file_path, format="m4a")
+    return AudioSegment.from_mp3(file_path)
+
 
-    interval_ms = interval_minutes * 60 * 1000
+def export_chunks(
+    audio: AudioSegment, file_path: str, interval_minutes: int = 10, tempo: float = 1.0
+) -> list[str]:
+    """
+    Export decoded audio as MP3 chunks of a specified length next to the source file.
+
+    With a `tempo` other than 1.0, each chunk is sped up without changing pitch
+    while it is encoded, and the chunks are cut `tempo` times longer so the
+    uploaded chunks still last about `interval_minutes`.
+
+    Args:
+        audio (AudioSegment): Audio to split.
+        file_path (str): Path of the source file, used to name the chunks.
+        interval_minutes (int): Length of each uploaded chunk in minutes.
+        tempo (float): Speed-up factor applied to every chunk.
+
+    Returns:
+        list[str]: List of file paths for the generated chunks.
+    """
+    interval_ms = int(interval_minutes * 60 * 1000 * tempo)
+    parameters = tempo_parameters(tempo)
     chunks = [audio[i: i + interval_ms]
               for i in range(0, len(audio), interval_ms)]
 
@@ -29,8 +50,22 @@ def split_audio(file_path: str, interval_minutes: int = 10) -> list[str]:
     spinner.start()
     for i, chunk in enumerate(chunks, start=1):
         chunk_name = f"{os.path.splitext(file_path)[0]}_part{i}.mp3"
-        chunk.export(chunk_name, format="mp3")
+        chunk.export(chunk_name, format="mp3", parameters=parameters)
         chunk_names.append(chunk_name)
     spinner.succeed(f"Audio split into {len(chunk_names)} chunks")
 
     return chunk_names
+
+
+def split_audio(file_path: str, interval_minutes: int = 10) -> list[str]:
+    """
+    Split an audio file into chunks of a specified length.
+
+    Args:
+        file_path (str): Path to the audio file to split.
+        interval_minutes (int): Length of each chunk in minutes.
+
+    Returns:
+        list[str]: List of file paths for the generated chunks.
+    """
+    return export_chunks(load_audio(file_path), file_path, interval_minutes)
@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+from typing import Dict, Any, Optional
+
+from ..config.config_manager import DEFAULT_STATE_FOLDER
+
+DEFAULT_STATS_FILE = os.path.join(DEFAULT_STATE_FOLDER, "stats.json")
+EWMA_ALPHA = 0.2
+
+
+class LatencyStats:
+    """
+    Provider request latencies observed in previous runs, persisted as JSON.
+
+    For each provider this keeps a request count, an EWMA of seconds per
+    request, and an EWMA of seconds per second of audio for requests whose
+    audio duration is known.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_FILE):
+        self.path = path
+        self.providers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    self.providers = json.load(file)
+            except (OSError, ValueError):
+                self.providers = {}
+
+    def record(self, provider: str, seconds: float, audio_seconds: Optional[float] = None) -> None:
+        """Fold one request's latency into the provider's running averages."""
+        with self._lock:
+            stats = self.providers.setdefault(provider, {"requests": 0})
+            stats["requests"] += 1
+            previous = stats.get("seconds_per_request")
+            stats["seconds_per_request"] = seconds if previous is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+            if audio_seconds:
+                sample = seconds / audio_seconds
+                previous = stats.get("seconds_per_audio_second")
+                stats["seconds_per_audio_second"] = sample if previous is None else EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * previous
+
+    def seconds_per_audio_second(self, provider: str) -> Optional[float]:
+        return self.providers.get(provider, {}).get("seconds_per_audio_second")
+
+    def requests(self, provider: str) -> int:
+        return self.providers.get(provider, {}).get("requests", 0)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(self.providers, file, indent=2)
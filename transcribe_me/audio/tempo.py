@@ -0,0 +1,91 @@
+import os
+import re
+from fnmatch import fnmatch
+from typing import Dict, Any, Optional
+
+# Range of a single pass of ffmpeg's atempo filter on every supported version.
+MIN_TEMPO = 0.5
+MAX_TEMPO = 2.0
+
+
+def resolve_tempo(file_path: str, config: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Look up the tempo factor to apply to an input file before upload.
+
+    The first profile whose filename pattern matches sets the factor. Files
+    that match no profile use `tempo.factor`. Nothing is sped up unless
+    `tempo.enabled` is set.
+
+    Args:
+        file_path (str): Path to the audio file.
+        config (Optional[Dict[str, Any]]): Configuration dictionary.
+
+    Returns:
+        float: The speed-up factor, where 1.0 leaves the audio unchanged.
+    """
+    tempo = (config or {}).get("tempo") or {}
+    if not tempo.get("enabled", False):
+        return 1.0
+
+    name = os.path.basename(file_path)
+    factor = next(
+        (factor for pattern, factor in (tempo.get("profiles") or {}).items() if fnmatch(name, pattern)),
+        tempo.get("factor", 1.0),
+    )
+    return min(max(float(factor), MIN_TEMPO), MAX_TEMPO)
+
+
+def tempo_parameters(factor: float) -> list[str]:
+    """
+    Build the ffmpeg arguments that change tempo without changing pitch.
+
+    The result is passed to `AudioSegment.export(parameters=...)`, so the
+    speed-up happens while the chunk is encoded rather than as a separate pass.
+
+    Args:
+        factor (float): Speed-up factor.
+
+    Returns:
+        list[str]: ffmpeg arguments, empty when `factor` is 1.0.
+    """
+    if factor == 1.0:
+        return []
+    return ["-filter:a", f"atempo={factor:g}"]
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lower-case a transcript and split it into words, ignoring punctuation."""
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the word error rate of a transcript against a reference.
+
+    The rate is the number of word substitutions, insertions and deletions
+    needed to turn the reference into the hypothesis, divided by the number
+    of words in the reference.
+
+    Args:
+        reference (str): The transcript taken as correct.
+        hypothesis (str): The transcript to score.
+
+    Returns:
+        float: The word error rate, 0.0 for identical transcripts.
+    """
+    expected = normalize_words(reference)
+    actual = normalize_words(hypothesis)
+    if not expected:
+        return float(bool(actual))
+
+    previous = list(range(len(actual) + 1))
+    for i, word in enumerate(expected, start=1):
+        current = [i] + [0] * len(actual)
+        for j, other in enumerate(actual, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (word != other),
+            )
+        previous = current
+    return previous[-1] / len(expected)
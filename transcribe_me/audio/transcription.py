@@ -1,11 +1,36 @@
 import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from glob import glob
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tqdm import tqdm
 from colorama import Fore
-from tenacity import retry, wait_exponential, stop_after_attempt
 
-from .splitting import split_audio
+from ..config.config_manager import DEFAULT_STATE_FOLDER
+from ..search import Passage, index_transcript, write_segments
+from .splitting import split_audio, load_audio, export_chunks
+from .silence import OffsetMap, compact_silence
+from .tempo import resolve_tempo
+from .report import RunReport
+from .scheduling import order_jobs
+from .packing import Clip, PACK_BITRATE, plan_packs, build_pack, split_segments
+from .fingerprint import FingerprintIndex, compute_fingerprint
+from .probing import probe_duration, probe_durations
+from .routing import ProviderRouter
+from .stats import LatencyStats
+from .planning import CHUNK_MINUTES, Plan, build_plan, print_plan
+from .retrying import (
+    DEFAULT_DEAD_LETTER_FOLDER,
+    INVALID_INPUT,
+    DeadlineExceededError,
+    RetryPolicy,
+    classify_error,
+    dead_letter,
+    transcript_failed,
+)
 
 
 class ProviderImportError(ImportError):
@@ -38,28 +63,192 @@ def _import_assemblyai():
         raise ProviderImportError("assemblyai", "assemblyai>=0.16.0")
 
 
-@retry(wait=wait_exponential(multiplier=1, min=4, max=60), stop=stop_after_attempt(5))
-def transcribe_chunk(file_path: str) -> str:
+def transcribe_chunk(file_path: str, policy: Optional[RetryPolicy] = None, report: Optional[RunReport] = None) -> str:
     """
     Transcribe an audio chunk using the OpenAI Whisper API.
-    Retry with exponential backoff in case of rate limiting.
+    Retry transient errors with exponential backoff within the budgets of `policy`.
+    Only the successful attempt is recorded in `report`, so backoff never inflates latencies.
     """
     openai = _import_openai()
-    with open(file_path, "rb") as audio_file:
-        try:
-            response = openai.audio.transcriptions.create(
-                language="en", model="whisper-1", file=audio_file
-            )
+    policy = policy or RetryPolicy()
+    for attempt in policy.retrying(file_path):
+        with attempt:
+            policy.check_deadline(file_path)
+            remaining = policy.remaining()
+            options = {"timeout": remaining} if remaining is not None else {}
+            started = time.monotonic()
+            with open(file_path, "rb") as audio_file:
+                response = openai.audio.transcriptions.create(
+                    language="en", model="whisper-1", file=audio_file, **options
+                )
+            if report is not None:
+                report.record_request("openai", time.monotonic() - started, probe_duration(file_path))
             return response.text
-        except openai.error.RateLimitError as e:
-            print(f"{Fore.YELLOW}Rate limit reached, retrying in a bit...")
-            raise e
-        except Exception as e:
-            print(f"{Fore.RED}An error occurred while transcribing {file_path}: {e}")
-            raise e
 
 
-def transcribe_audio(file_path: str, output_path: str, config: Dict[str, Any]) -> None:
+def _segment_field(segment: Any, name: str) -> Any:
+    """Read a field from a Whisper segment, which may be a model object or a dict."""
+    if isinstance(segment, dict):
+        return segment[name]
+    return getattr(segment, name)
+
+
+_openai_clients: Dict[Optional[str], Any] = {}
+
+
+def openai_client(api_key: Optional[str] = None) -> Any:
+    """
+    Return a shared OpenAI client for an API key, creating it on first use.
+
+    Without an explicit key the module-level client is used, which reads
+    OPENAI_API_KEY from the environment.
+    """
+    openai = _import_openai()
+    if api_key is None:
+        return openai
+    if api_key not in _openai_clients:
+        _openai_clients[api_key] = openai.OpenAI(api_key=api_key)
+    return _openai_clients[api_key]
+
+
+def request_chunk_segments(
+    file_path: str,
+    client: Any = None,
+    language: str = "en",
+    model: str = "whisper-1",
+    granularity: str = "segment",
+    timeout: Optional[float] = None,
+) -> list[tuple[float, float, str]]:
+    """
+    Send one audio chunk to the OpenAI Whisper API and return its timestamped segments.
+
+    This makes a single request without retrying or printing anything.
+
+    Args:
+        file_path (str): Path to the audio chunk.
+        client (Any): OpenAI client to use, defaulting to the module-level client.
+        language (str): Language of the audio.
+        model (str): Whisper model to use.
+        granularity (str): "segment" for sentence-like segments, or "word" for single words.
+        timeout (Optional[float]): Seconds after which the HTTP request is abandoned.
+
+    Returns:
+        list[tuple[float, float, str]]: (start_ms, end_ms, text) for each segment or word.
+    """
+    client = client or openai_client()
+    options = {"timeout": timeout} if timeout is not None else {}
+    with open(file_path, "rb") as audio_file:
+        response = client.audio.transcriptions.create(
+            language=language,
+            model=model,
+            file=audio_file,
+            response_format="verbose_json",
+            timestamp_granularities=[granularity],
+            **options,
+        )
+    if granularity == "word":
+        items, text_field = response.words, "word"
+    else:
+        items, text_field = response.segments, "text"
+    return [
+        (
+            _segment_field(item, "start") * 1000,
+            _segment_field(item, "end") * 1000,
+            _segment_field(item, text_field),
+        )
+        for item in items or []
+    ]
+
+
+def transcribe_chunk_segments(
+    file_path: str,
+    policy: Optional[RetryPolicy] = None,
+    granularity: str = "segment",
+    report: Optional[RunReport] = None,
+) -> list[tuple[float, float, str]]:
+    """
+    Transcribe an audio chunk using the OpenAI Whisper API, keeping segment or word timestamps.
+    Retry transient errors with exponential backoff within the budgets of `policy`.
+    Only the successful attempt is recorded in `report`.
+
+    Returns:
+        list[tuple[float, float, str]]: (start_ms, end_ms, text) for each segment or word.
+    """
+    policy = policy or RetryPolicy()
+    for attempt in policy.retrying(file_path):
+        with attempt:
+            policy.check_deadline(file_path)
+            started = time.monotonic()
+            segments = request_chunk_segments(file_path, granularity=granularity, timeout=policy.remaining())
+            if report is not None:
+                report.record_request("openai", time.monotonic() - started, probe_duration(file_path))
+            return segments
+
+
+def assemblyai_transcriber(api_key: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    """
+    Return an AssemblyAI transcriber with its own client.
+
+    The key and HTTP timeout are set on that client rather than on the SDK's
+    process-wide `aai.settings`, so concurrent calls never see each other's.
+
+    Args:
+        api_key (Optional[str]): AssemblyAI API key, defaulting to ASSEMBLYAI_API_KEY.
+        timeout (Optional[float]): Seconds after which each HTTP request is abandoned.
+    """
+    aai = _import_assemblyai()
+    settings = {"api_key": api_key} if api_key else {}
+    if timeout is not None:
+        settings["http_timeout"] = timeout
+    return aai.Transcriber(client=aai.Client(settings=aai.Settings(**settings)))
+
+
+def wait_for_transcript(transcriber: Any, file_path: str, transcription_config: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Upload a file to AssemblyAI and wait for its transcript, for at most `timeout` seconds.
+
+    Raises:
+        DeadlineExceededError: If the transcript is not ready in time.
+    """
+    if timeout is None:
+        return transcriber.transcribe(file_path, config=transcription_config)
+    future = transcriber.transcribe_async(file_path, config=transcription_config)
+    try:
+        return future.result(timeout=max(timeout, 0))
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceededError(f"AssemblyAI did not transcribe {file_path} within {timeout:.0f}s")
+
+
+def transcribe_segments_with_assemblyai(
+    file_path: str, api_key: Optional[str] = None, timeout: Optional[float] = None
+) -> list[tuple[float, float, str]]:
+    """
+    Transcribe an audio file using AssemblyAI, keeping word timestamps.
+
+    Args:
+        file_path (str): Path to the audio file.
+        api_key (Optional[str]): AssemblyAI API key, defaulting to ASSEMBLYAI_API_KEY.
+        timeout (Optional[float]): Seconds to wait for the transcript before giving up.
+
+    Returns:
+        list[tuple[float, float, str]]: (start_ms, end_ms, text) for each word.
+    """
+    aai = _import_assemblyai()
+    transcription_config = aai.TranscriptionConfig(speech_model=aai.SpeechModel.nano)
+    transcript = wait_for_transcript(assemblyai_transcriber(api_key, timeout), file_path, transcription_config, timeout)
+    if transcript.status == aai.TranscriptStatus.error:
+        raise transcript_failed(transcript.error)
+    return [(word.start, word.end, word.text) for word in transcript.words or []]
+
+
+def transcribe_audio(
+    file_path: str,
+    output_path: str,
+    config: Dict[str, Any],
+    report: Optional[RunReport] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> None:
     """
     Transcribe an audio file using either OpenAI Whisper API or AssemblyAI.
 
@@ -67,21 +256,185 @@ def transcribe_audio(file_path: str, output_path: str, config: Dict[str, Any]) -
         file_path (str): Path to the audio file to transcribe.
         output_path (str): Path to the output file for the transcription.
         config (Dict[str, Any]): Configuration dictionary.
+        report (Optional[RunReport]): Report to record per-file statistics in.
+        policy (Optional[RetryPolicy]): Retry budgets and deadline for the file, built from `config` if not given.
     """
     use_assemblyai = config.get("use_assemblyai", False)
 
     if use_assemblyai:
-        transcribe_with_assemblyai(file_path, output_path, config)
+        transcribe_with_assemblyai(file_path, output_path, config, report, policy)
+    else:
+        transcribe_with_openai(file_path, output_path, config, report, policy)
+
+
+def transcribe_with_provider(
+    provider: str,
+    file_path: str,
+    output_path: str,
+    config: Dict[str, Any],
+    report: Optional[RunReport] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> None:
+    """
+    Transcribe an audio file with an explicitly chosen provider.
+
+    Args:
+        provider (str): Either "openai" or "assemblyai".
+        file_path (str): Path to the audio file to transcribe.
+        output_path (str): Path to the output file for the transcription.
+        config (Dict[str, Any]): Configuration dictionary.
+        report (Optional[RunReport]): Report to record per-file statistics in.
+        policy (Optional[RetryPolicy]): Retry budgets and deadline for the file, built from `config` if not given.
+    """
+    if provider == "assemblyai":
+        transcribe_with_assemblyai(file_path, output_path, config, report, policy)
+    else:
+        transcribe_with_openai(file_path, output_path, config, report, policy)
+
+
+def transcribe_routed(
+    router: ProviderRouter,
+    file_path: str,
+    output_path: str,
+    config: Dict[str, Any],
+    report: Optional[RunReport] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> str:
+    """
+    Transcribe an audio file on whichever provider the router picks, failing over on error.
+
+    Inputs that fail as invalid are not failed over, since every provider
+    would reject them, and do not count against the provider's health.
+    Neither do files whose deadline has passed, since the next provider
+    would fail at once.
+
+    Args:
+        router (ProviderRouter): Router shared by all files in the batch.
+        file_path (str): Path to the audio file to transcribe.
+        output_path (str): Path to the output file for the transcription.
+        config (Dict[str, Any]): Configuration dictionary.
+        report (Optional[RunReport]): Report to record per-file statistics in.
+        policy (Optional[RetryPolicy]): Retry budgets and deadline shared by every provider tried.
+
+    Returns:
+        str: The provider that produced the transcription.
+    """
+    duration = probe_duration(file_path)
+    policy = policy or RetryPolicy.from_config(config)
+    tried: tuple = ()
+    last_error: Exception = None
+
+    while True:
+        provider = router.acquire(duration, exclude=tried)
+        if provider is None:
+            raise RuntimeError(
+                f"No provider available for {file_path}: {last_error or 'all circuit breakers are open'}"
+            ) from last_error
+
+        started = time.monotonic()
+        try:
+            transcribe_with_provider(provider, file_path, output_path, config, report, policy)
+        except Exception as e:
+            final = classify_error(e) == INVALID_INPUT or isinstance(e, DeadlineExceededError) or policy.expired()
+            router.release(provider, duration, time.monotonic() - started, ok=False, observe=not final)
+            if final:
+                raise
+            print(f"{Fore.YELLOW}{provider} failed on {file_path}, failing over: {e}")
+            tried += (provider,)
+            last_error = e
+            continue
+
+        router.release(provider, duration, time.monotonic() - started, ok=True)
+        return provider
+
+
+def _index_transcript(
+    output_path: str, config: Optional[Dict[str, Any]], passages: Optional[list[Passage]] = None
+) -> None:
+    """Add a transcript to the search index unless `search.enabled` is turned off."""
+    if not ((config or {}).get("search") or {}).get("enabled", True):
+        return
+    try:
+        index_transcript(output_path, passages)
+    except (sqlite3.Error, OSError) as e:
+        print(f"{Fore.YELLOW}Could not add {output_path} to the search index: {e}")
+
+
+def _write_transcript(
+    output_path: str, text: str, config: Optional[Dict[str, Any]], passages: Optional[list[Passage]] = None
+) -> None:
+    """Write a transcript and its passage timestamps, then add it to the search index."""
+    with open(output_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    if passages:
+        write_segments(output_path, passages)
+    _index_transcript(output_path, config, passages or [(None, None, text)])
+
+
+def _split_prepared(
+    file_path: str, output_path: str, config: Dict[str, Any], tempo: float, report: Optional[RunReport]
+) -> tuple[list[str], OffsetMap]:
+    """
+    Shorten long silences and speed up the audio before splitting, saving an offset map next to the transcript.
+
+    The map, written to `<transcript>.offsets.json`, translates positions in the
+    uploaded audio back to the original recording.
+    """
+    audio = load_audio(file_path)
+    silence_options = config.get("silence_compaction") or {}
+    compacted = silence_options.get("enabled", False)
+    if compacted:
+        audio, offset_map = compact_silence(
+            audio,
+            min_silence_ms=silence_options.get("min_silence_ms", 2000),
+            threshold_db=silence_options.get("threshold_db", -16.0),
+            keep_silence_ms=silence_options.get("keep_silence_ms", 500),
+        )
+        offset_map.tempo = tempo
     else:
-        transcribe_with_openai(file_path, output_path)
+        offset_map = OffsetMap.identity(len(audio), tempo)
+    offset_map.save(f"{os.path.splitext(output_path)[0]}.offsets.json")
 
+    if report is not None:
+        compacted_ms = offset_map.compacted_ms
+        stats = {"original_ms": offset_map.original_ms, "tempo_saved_ms": compacted_ms - compacted_ms / tempo}
+        if compacted:
+            stats["silence_removed_ms"] = offset_map.original_ms - compacted_ms
+        report.record(file_path, **stats)
+    return export_chunks(audio, file_path, CHUNK_MINUTES, tempo=tempo), offset_map
 
-def transcribe_with_openai(file_path: str, output_path: str) -> None:
+
+def transcribe_with_openai(
+    file_path: str,
+    output_path: str,
+    config: Optional[Dict[str, Any]] = None,
+    report: Optional[RunReport] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> None:
     """
     Transcribe an audio file using the OpenAI Whisper API.
+
+    When `silence_compaction.enabled` is set, long silences are shortened, and
+    when a tempo applies to the file it is sped up, before the audio is split
+    and uploaded. If any chunk still fails once `policy` gives up, the file
+    fails and no transcript is written.
     """
-    chunk_files = split_audio(file_path)
+    config = config or {}
+    policy = policy or RetryPolicy.from_config(config)
+    tempo = resolve_tempo(file_path, config)
+    offset_map = None
+    if tempo != 1.0 or (config.get("silence_compaction") or {}).get("enabled", False):
+        chunk_files, offset_map = _split_prepared(file_path, output_path, config, tempo, report)
+    else:
+        chunk_files = split_audio(file_path, CHUNK_MINUTES)
     full_transcription = ""
+    passages = []
+
+    def to_original(index: int) -> Optional[float]:
+        position_ms = index * CHUNK_MINUTES * 60 * 1000
+        if offset_map is None:
+            return position_ms if index < len(chunk_files) else None
+        return offset_map.to_original(position_ms) if index < len(chunk_files) else offset_map.original_ms
 
     progress_bar = tqdm(
         chunk_files,
@@ -89,28 +442,35 @@ def transcribe_with_openai(file_path: str, output_path: str) -> None:
         unit="chunk",
         bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
     )
-    for chunk_file in progress_bar:
+    for index, chunk_file in enumerate(progress_bar):
         try:
-            transcription = transcribe_chunk(chunk_file)
+            transcription = transcribe_chunk(chunk_file, policy, report)
             full_transcription += transcription + " "
+            passages.append((to_original(index), to_original(index + 1), transcription))
         except Exception as e:
             print(
                 f"{Fore.RED}An error occurred while transcribing chunk {chunk_file}: {e}"
             )
+            raise
         finally:
             os.remove(chunk_file)
 
-    with open(output_path, "w", encoding="utf-8") as file:
-        file.write(full_transcription)
+    _write_transcript(output_path, full_transcription, config, passages)
 
 
 def transcribe_with_assemblyai(
-    file_path: str, output_path: str, config: Dict[str, Any]
+    file_path: str,
+    output_path: str,
+    config: Dict[str, Any],
+    report: Optional[RunReport] = None,
+    policy: Optional[RetryPolicy] = None,
 ) -> None:
     """
     Transcribe an audio file using AssemblyAI.
+    Retry transient errors with exponential backoff within the budgets of `policy`.
     """
     aai = _import_assemblyai()
+    policy = policy or RetryPolicy.from_config(config)
     
     transcription_config = aai.TranscriptionConfig(
         speech_model=aai.SpeechModel.nano,
@@ -119,46 +479,330 @@ def transcribe_with_assemblyai(
         sentiment_analysis=True,
         iab_categories=True,
     )
-    transcriber = aai.Transcriber()
 
-    transcript = transcriber.transcribe(file_path, config=transcription_config)
+    for attempt in policy.retrying(file_path):
+        with attempt:
+            policy.check_deadline(file_path)
+            remaining = policy.remaining()
+            started = time.monotonic()
+            transcript = wait_for_transcript(
+                assemblyai_transcriber(timeout=remaining), file_path, transcription_config, remaining
+            )
+            if getattr(transcript, "error", None):
+                raise transcript_failed(transcript.error)
+    # Only the successful attempt is recorded, so backoff never inflates latencies.
+    if report is not None:
+        report.record_request("assemblyai", time.monotonic() - started, probe_duration(file_path))
 
-    # Write transcription to file
-    with open(output_path, "w", encoding="utf-8") as file:
-        file.write(transcript.text)
+    # Write transcription to file, with utterance timestamps for the search index
+    utterances = getattr(transcript, "utterances", None) or []
+    passages = [(utterance.start, utterance.end, utterance.text) for utterance in utterances]
+    _write_transcript(output_path, transcript.text, config, passages)
 
     # Write additional information to separate files
     base_name = os.path.splitext(output_path)[0]
 
+def _pending_files(input_folder: str, output_folder: str) -> list[tuple[str, str]]:
+    """
+    List the audio files in the input folder that have no transcription yet.
+
+    Returns:
+        list[tuple[str, str]]: Pairs of (audio file path, output transcription path).
+    """
+    pending = []
+    for filename in os.listdir(input_folder):
+        if not (filename.endswith(".mp3") or filename.endswith(".m4a")):
+            continue
+
+        transcription_name = os.path.splitext(filename)[0]
+        output_file = os.path.join(output_folder, f"{transcription_name}.txt")
+        if os.path.exists(output_file):
+            continue
+
+        pending.append((os.path.join(input_folder, filename), output_file))
+    return pending
+
+
+def _remove_chunks(file_path: str) -> None:
+    """Delete any _part* MP3 files left behind by split_audio."""
+    for file in glob(f"{os.path.splitext(file_path)[0]}_part*.mp3"):
+        os.remove(file)
+
+
+def _transcribe_pack(clips: list[Clip], config: Dict[str, Any], separator_ms: int, report: RunReport) -> None:
+    """Upload a pack of clips as one request and write each clip's share of the transcript."""
+    audio, spans = build_pack(clips, separator_ms)
+    handle, pack_path = tempfile.mkstemp(suffix=".mp3", prefix="transcribe-me-pack-")
+    os.close(handle)
+    provider = "assemblyai" if config.get("use_assemblyai", False) else "openai"
+    policy = RetryPolicy.from_config(config)
+    try:
+        audio.export(pack_path, format="mp3", bitrate=PACK_BITRATE)
+        if provider == "assemblyai":
+            started = time.monotonic()
+            segments = transcribe_segments_with_assemblyai(pack_path, timeout=policy.remaining())
+            report.record_request(provider, time.monotonic() - started, len(audio) / 1000)
+        else:
+            # Whisper segments can run across a separator, so packs are split word by word.
+            segments = transcribe_chunk_segments(pack_path, policy, granularity="word", report=report)
+    finally:
+        os.remove(pack_path)
+
+    for clip, text in zip(clips, split_segments(segments, spans)):
+        _write_transcript(clip.output_path, text, config)
+
+
+def _process_packed(
+    pending: list[tuple[str, str]], config: Dict[str, Any], report: RunReport
+) -> list[tuple[str, str]]:
+    """
+    Transcribe short clips by packing several into each provider request.
+
+    Packs that fail have their clips handed back for individual transcription.
+
+    Returns:
+        list[tuple[str, str]]: The files that still need transcribing on their own, in their order in `pending`.
+    """
+    options = config.get("packing") or {}
+    max_clip_ms = options.get("max_clip_seconds", 120) * 1000
+    separator_ms = options.get("separator_ms", 1500)
+
+    durations = probe_durations([file_path for file_path, _ in pending])
+
+    clips = [
+        Clip(file_path, output_file, int(duration * 1000))
+        for (file_path, output_file), duration in zip(pending, durations)
+        if 0 < duration * 1000 <= max_clip_ms
+    ]
+    packs = plan_packs(
+        clips,
+        max_pack_ms=options.get("max_pack_seconds", 600) * 1000,
+        max_pack_bytes=options.get("max_pack_bytes", 24 * 1024 * 1024),
+        separator_ms=separator_ms,
+    )
+    packs = [pack for pack in packs if len(pack) > 1]
+    if not packs:
+        return pending
+
+    packed = set()
+    print(f"{Fore.BLUE}Packing {sum(len(pack) for pack in packs)} short clips into {len(packs)} requests\n")
+    with ThreadPoolExecutor(max_workers=options.get("concurrency", 2)) as executor:
+        futures = {executor.submit(_transcribe_pack, pack, config, separator_ms, report): pack for pack in packs}
+        for future in tqdm(futures, desc="Transcribing packs", unit="pack"):
+            pack = futures[future]
+            error = future.exception()
+            if error:
+                print(f"{Fore.YELLOW}A pack of {len(pack)} clips failed, transcribing them one by one: {error}")
+                continue
+            for clip in pack:
+                packed.add(clip.file_path)
+                report.record(clip.file_path, packed_with=len(pack))
+    # Everything left, including clips from failed packs, keeps its place in the scheduled order.
+    return [(file_path, output_file) for file_path, output_file in pending if file_path not in packed]
+
+
+def _deduplicate(
+    pending: list[tuple[str, str]], config: Dict[str, Any]
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    Match pending files against the fingerprint index and drop near-duplicates.
+
+    Duplicates of an already transcribed recording have its transcript copied
+    straight away. Duplicates of another file in the same batch are deferred
+    until that file has been transcribed. Files are indexed before they are
+    transcribed, so a file never matches its own entry, and entries whose
+    transcript was never written are dropped unless that file is queued again.
+
+    Returns:
+        tuple: The files still to transcribe, and deferred (output, source transcript) copies.
+    """
+    options = config.get("deduplication") or {}
+    index_path = options.get("index_path", os.path.join(DEFAULT_STATE_FOLDER, "fingerprints.db"))
+    min_coverage = options.get("min_coverage", 0.9)
+    max_bit_error_rate = options.get("max_bit_error_rate", 0.35)
+
+    unique = []
+    deferred = []
+    planned = {output_file for _, output_file in pending}
+    index = FingerprintIndex(index_path)
+    try:
+        for file_path, output_file in tqdm(pending, desc="Fingerprinting", unit="file"):
+            try:
+                fingerprint = compute_fingerprint(file_path)
+            except Exception as e:
+                print(f"{Fore.YELLOW}Could not fingerprint {file_path}, transcribing it anyway: {e}")
+                unique.append((file_path, output_file))
+                continue
+
+            # A file indexed on an earlier run that failed must not match itself.
+            match = index.lookup(fingerprint, max_bit_error_rate, exclude_path=file_path)
+            if match and match.coverage >= min_coverage:
+                if os.path.exists(match.transcript_path):
+                    shutil.copyfile(match.transcript_path, output_file)
+                    _index_transcript(output_file, config)
+                    print(f"{Fore.GREEN}{file_path} duplicates {match.source_path}, reused its transcript")
+                    continue
+                if match.transcript_path in planned:
+                    deferred.append((output_file, match.transcript_path))
+                    continue
+                # The matched recording was never transcribed and is not queued, so its entry is stale.
+                index.remove(match.source_path)
+            elif match:
+                print(
+                    f"{Fore.YELLOW}{file_path} overlaps {match.source_path} "
+                    f"for {match.overlap_seconds:.0f}s at offset {match.offset_seconds:.0f}s"
+                )
+
+            index.add(file_path, output_file, fingerprint)
+            unique.append((file_path, output_file))
+    finally:
+        index.close()
+    return unique, deferred
+
+
+def _copy_deferred(deferred: list[tuple[str, str]], config: Dict[str, Any]) -> None:
+    """Copy transcripts for in-batch duplicates once their source has been transcribed."""
+    for output_file, source in deferred:
+        if os.path.exists(source):
+            shutil.copyfile(source, output_file)
+            _index_transcript(output_file, config)
+            print(f"{Fore.GREEN}Reused {source} for duplicate {output_file}")
+
+
+def _handle_failure(file_path: str, error: Exception, config: Dict[str, Any], report: RunReport) -> None:
+    """
+    Record a file that failed, moving it to the dead-letter folder if the input itself is at fault.
+
+    Any other failure leaves the file in the input folder, so the next run tries it again.
+    """
+    kind = classify_error(error)
+    report.record(file_path, failed=kind)
+    if kind != INVALID_INPUT:
+        print(f"{Fore.RED}{file_path} failed ({kind}) and will be retried on the next run: {error}")
+        return
+
+    folder = (config.get("retry") or {}).get("dead_letter_folder", DEFAULT_DEAD_LETTER_FOLDER)
+    try:
+        location = dead_letter(file_path, error, folder)
+    except OSError as e:
+        print(f"{Fore.RED}{file_path} cannot be transcribed and could not be moved to {folder}: {e}")
+        return
+    report.record(file_path, dead_letter=location)
+    print(f"{Fore.RED}{file_path} cannot be transcribed, moved to {location}: {error}")
+
+
+def _process_routed(
+    pending: list[tuple[str, str]], config: Dict[str, Any], report: RunReport
+) -> None:
+    """
+    Transcribe pending files concurrently across both providers.
+
+    Files that fail are handled by `_handle_failure` while the rest continue.
+    """
+    router = ProviderRouter(config, LatencyStats())
+
+    def process(file_path: str, output_file: str) -> None:
+        try:
+            print(f"{Fore.BLUE}Transcribing audio file: {file_path}\n")
+            provider = transcribe_routed(router, file_path, output_file, config, report)
+            print(f"{Fore.GREEN}Transcribed {file_path} with {provider}")
+        except Exception as e:
+            _handle_failure(file_path, e, config, report)
+        finally:
+            _remove_chunks(file_path)
+
+    with ThreadPoolExecutor(max_workers=router.total_concurrency) as executor:
+        for job in pending:
+            executor.submit(process, *job)
+
+
+def _save_latencies(report: RunReport) -> None:
+    """Add this run's request latencies to the stats used by routing and planning."""
+    if not report.requests:
+        return
+    stats = LatencyStats()
+    for provider, seconds, audio_seconds in report.requests:
+        stats.record(provider, seconds, audio_seconds)
+    stats.save()
+
+
 def process_audio_files(
     input_folder: str, output_folder: str, config: Dict[str, Any]
 ) -> None:
     """
     Process audio files in the input folder, transcribe them, and save the transcriptions in the output folder.
 
+    A file that fails does not stop the batch. Transient errors are retried
+    within the `retry` budgets first, and inputs that can never be transcribed
+    are moved to the dead-letter folder with the error recorded beside them.
+
+    When `deduplication.enabled` is set, near-duplicate recordings reuse an
+    existing transcript instead of being sent to a provider. The remaining
+    files are ordered by the `scheduling.policy`. When `packing.enabled` is set, short clips are concatenated so several share
+    one provider request. When `routing.enabled` is set, files are spread across OpenAI and AssemblyAI
+    concurrently instead of using the single provider chosen by `use_assemblyai`.
+
     Args:
         input_folder (str): Path to the input folder containing audio files.
         output_folder (str): Path to the output folder to save transcriptions.
         config (Dict[str, Any]): Configuration dictionary.
     """
-    for filename in os.listdir(input_folder):
-        file_path = os.path.join(input_folder, filename)
+    pending = _pending_files(input_folder, output_folder)
+    deferred = []
+    report = RunReport()
 
-        if not (filename.endswith(".mp3") or filename.endswith(".m4a")):
-            continue
+    if (config.get("deduplication") or {}).get("enabled", False):
+        pending, deferred = _deduplicate(pending, config)
+    pending = order_jobs(pending, config)
 
-        transcription_name = os.path.splitext(filename)[0]
-        output_file = os.path.join(output_folder, f"{transcription_name}.txt")
+    try:
+        if (config.get("packing") or {}).get("enabled", False):
+            pending = _process_packed(pending, config, report)
 
-        try:
-            if not os.path.exists(output_file):
+        if (config.get("routing") or {}).get("enabled", False):
+            _process_routed(pending, config, report)
+            return
+
+        for file_path, output_file in pending:
+            try:
                 print(f"{Fore.BLUE}Transcribing audio file: {file_path}\n")
-                transcribe_audio(file_path, output_file, config)
-        except Exception as e:
-            print(f"{Fore.RED}An error occurred while processing {file_path}: {e}")
-            raise e
-        finally:
-            # Delete the _part* MP3 files if using OpenAI
-            if not config.get("use_assemblyai", False):
-                for file in glob(f"{file_path.partition('.')[0]}_part*.mp3"):
-                    os.remove(file)
+                transcribe_audio(file_path, output_file, config, report)
+            except Exception as e:
+                _handle_failure(file_path, e, config, report)
+            finally:
+                # Delete the _part* MP3 files if using OpenAI
+                if not config.get("use_assemblyai", False):
+                    _remove_chunks(file_path)
+    finally:
+        _copy_deferred(deferred, config)
+        report.print_summary()
+        _save_latencies(report)
+
+
+def plan_audio_files(
+    input_folder: str,
+    output_folder: str,
+    config: Dict[str, Any],
+    concurrency: Optional[int] = None,
+    requests_per_minute: Optional[float] = None,
+) -> Plan:
+    """
+    Predict the cost of processing the input folder without transcribing anything.
+
+    Args:
+        input_folder (str): Path to the input folder containing audio files.
+        output_folder (str): Path to the output folder to save transcriptions.
+        config (Dict[str, Any]): Configuration dictionary.
+        concurrency (Optional[int]): Workers to plan for. Defaults to the routing caps, or 1.
+        requests_per_minute (Optional[float]): Provider rate limit to plan for.
+
+    Returns:
+        Plan: The prediction, which is also printed.
+    """
+    if concurrency is None:
+        routed = (config.get("routing") or {}).get("enabled", False)
+        concurrency = ProviderRouter(config).total_concurrency if routed else 1
+
+    plan = build_plan(_pending_files(input_folder, output_folder), config)
+    print_plan(plan, concurrency, requests_per_minute)
+    return plan
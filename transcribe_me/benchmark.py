@@ -0,0 +1,127 @@
+"""
+Tempo benchmark for `transcribe-me benchmark`.
+
+Each recording is transcribed unmodified and again at every candidate tempo.
+The report shows how much audio each tempo saves and the word error rate of
+its transcript against the unmodified one, so a speed-up can be enabled only
+for the recordings where the accuracy cost is acceptable.
+"""
+import asyncio
+import dataclasses
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from colorama import Fore
+
+from .api import TranscriptionOptions, transcribe
+from .audio.probing import probe_duration
+from .audio.report import format_duration
+from .audio.tempo import word_error_rate
+
+DEFAULT_TEMPOS = (1.25, 1.5)
+
+
+@dataclass
+class TempoResult:
+    """Duration saved and accuracy drift of one recording at one tempo."""
+
+    file_path: str
+    tempo: float
+    original_seconds: float
+    word_error_rate: float
+
+    @property
+    def saved_seconds(self) -> float:
+        return self.original_seconds - self.original_seconds / self.tempo
+
+
+async def benchmark_file(
+    file_path: str, options: TranscriptionOptions, tempos: tuple[float, ...] = DEFAULT_TEMPOS
+) -> list[TempoResult]:
+    """
+    Transcribe a recording unmodified and at each tempo, and compare the transcripts.
+
+    Args:
+        file_path (str): Path to the audio file.
+        options (TranscriptionOptions): Settings shared by every transcription.
+        tempos (tuple[float, ...]): Speed-up factors to try.
+
+    Returns:
+        list[TempoResult]: One result per tempo.
+    """
+    original_seconds = probe_duration(file_path)
+    reference = await transcribe(file_path, dataclasses.replace(options, tempo=1.0))
+    results = []
+    for tempo in tempos:
+        trial = await transcribe(file_path, dataclasses.replace(options, tempo=tempo))
+        results.append(TempoResult(file_path, tempo, original_seconds, word_error_rate(reference.text, trial.text)))
+    return results
+
+
+def benchmark_tempo(
+    files: list[str], options: TranscriptionOptions, tempos: tuple[float, ...] = DEFAULT_TEMPOS
+) -> list[TempoResult]:
+    """Benchmark each file in turn and return every result."""
+
+    async def run() -> list[TempoResult]:
+        results = []
+        for file_path in files:
+            results.extend(await benchmark_file(file_path, options, tempos))
+        return results
+
+    return asyncio.run(run())
+
+
+def print_benchmark(results: list[TempoResult]) -> None:
+    """Print one line per recording and tempo, then the totals for each tempo."""
+    print(f"{Fore.CYAN}Tempo benchmark:")
+    for result in results:
+        print(
+            f"{Fore.CYAN}  {os.path.basename(result.file_path)} at {result.tempo:g}x: "
+            f"saved {format_duration(result.saved_seconds * 1000)}, "
+            f"word error rate {result.word_error_rate:.1%}"
+        )
+
+    for tempo in sorted({result.tempo for result in results}):
+        group = [result for result in results if result.tempo == tempo]
+        original = sum(result.original_seconds for result in group)
+        saved = sum(result.saved_seconds for result in group)
+        mean_rate = sum(result.word_error_rate for result in group) / len(group)
+        worst = max(group, key=lambda result: result.word_error_rate)
+        print(
+            f"{Fore.CYAN}  Total at {tempo:g}x: saved {format_duration(saved * 1000)} "
+            f"of {format_duration(original * 1000)}, mean word error rate {mean_rate:.1%}, "
+            f"worst {worst.word_error_rate:.1%} ({os.path.basename(worst.file_path)})"
+        )
+
+
+def benchmark_folder(
+    input_folder: str,
+    options: TranscriptionOptions,
+    tempos: Optional[tuple[float, ...]] = None,
+    limit: Optional[int] = None,
+) -> list[TempoResult]:
+    """
+    Benchmark the recordings in a folder and print the report.
+
+    Args:
+        input_folder (str): Folder containing MP3 and M4A files.
+        options (TranscriptionOptions): Settings shared by every transcription.
+        tempos (Optional[tuple[float, ...]]): Speed-up factors to try. Defaults to 1.25x and 1.5x.
+        limit (Optional[int]): Benchmark at most this many recordings.
+
+    Returns:
+        list[TempoResult]: One result per recording and tempo.
+    """
+    files = sorted(
+        os.path.join(input_folder, name)
+        for name in os.listdir(input_folder)
+        if name.endswith(".mp3") or name.endswith(".m4a")
+    )[:limit]
+    results = benchmark_tempo(files, options, tuple(tempos or DEFAULT_TEMPOS))
+    if results:
+        print_benchmark(results)
+    else:
+        print(f"{Fore.YELLOW}No recordings to benchmark in {input_folder}")
+    return results
@@ -1,6 +1,8 @@
 import argparse
 from transcribe_me.config import config_manager
 from transcribe_me.audio import transcription
+from transcribe_me import benchmark, search, server
+from transcribe_me.api import TranscriptionOptions
 
 
 def parse_arguments():
@@ -10,8 +12,16 @@ def parse_arguments():
     parser.add_argument(
         "command",
         nargs="?",
-        choices=["install", "archive"],
-        help="Install the configuration file or archive files.",
+        choices=["install", "archive", "restore", "serve", "benchmark", "search"],
+        help=(
+            "Install the configuration file, archive files, restore a file from an archive bundle, "
+            "run the HTTP job service, benchmark tempo speed-ups, or search transcripts."
+        ),
+    )
+    parser.add_argument(
+        "query",
+        nargs="?",
+        help="Words to look for with the search command.",
     )
     parser.add_argument(
         "--input",
@@ -25,7 +35,78 @@ def parse_arguments():
         default="output",
         help="Path to the output folder to save transcriptions and summaries.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Archive into a compressed bundle even when files could be moved.",
+    )
+    parser.add_argument(
+        "--bundle-file",
+        type=str,
+        help="Path to the archive bundle to restore from.",
+    )
+    parser.add_argument(
+        "--member",
+        type=str,
+        help="File to restore from the bundle, e.g. output/meeting.txt.",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        help="Interface for the serve command to listen on.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port for the serve command to listen on.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of jobs the serve command transcribes at the same time.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="Number of jobs the serve command queues before rejecting new ones.",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Predict audio duration, chunks, upload size, requests and wall time without transcribing.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Number of concurrent workers to assume when planning.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Provider requests per minute to assume when planning.",
+    )
+    parser.add_argument(
+        "--tempo",
+        type=float,
+        nargs="+",
+        help="Speed-up factors for the benchmark command to compare against unmodified audio.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Number of recordings the benchmark command transcribes, or hits the search command shows.",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Refresh the search index from the output and archive folders before searching.",
+    )
+    args = parser.parse_args()
+    if args.command == "restore" and not (args.bundle_file and args.member):
+        parser.error("restore requires --bundle-file and --member")
+    if args.command == "search" and not (args.query or args.rebuild):
+        parser.error("search requires a query or --rebuild")
+    return args
 
 
 def main():
@@ -36,14 +117,53 @@ def main():
         return
 
     if args.command == "archive":
-        config_manager.archive_files(args.input, args.output)
+        summary = config_manager.archive_files(args.input, args.output, bundle=args.bundle)
+        if summary:
+            search.relocate_transcripts(summary["moved"])
+        return
+
+    if args.command == "restore":
+        config_manager.restore_file(args.bundle_file, args.member, args.input, args.output)
+        return
+
+    if args.command == "search":
+        search.search_folder(
+            args.query,
+            args.output,
+            config_manager.DEFAULT_ARCHIVE_FOLDER,
+            limit=args.limit or 20,
+            rebuild=args.rebuild,
+        )
         return
 
     config = config_manager.load_config()
 
+    if args.command == "serve":
+        serve_config = config.get("server") or {}
+        server.serve(
+            TranscriptionOptions.from_config(config),
+            host=args.host or serve_config.get("host", server.DEFAULT_HOST),
+            port=args.port or serve_config.get("port", server.DEFAULT_PORT),
+            workers=args.workers or serve_config.get("workers", server.DEFAULT_WORKERS),
+            queue_size=args.queue_size or serve_config.get("queue_size", server.DEFAULT_QUEUE_SIZE),
+        )
+        return
+
+    if args.command == "benchmark":
+        benchmark.benchmark_folder(
+            args.input, TranscriptionOptions.from_config(config), args.tempo, args.limit
+        )
+        return
+
     input_folder = args.input
     output_folder = args.output
 
+    if args.plan:
+        transcription.plan_audio_files(
+            input_folder, output_folder, config, args.concurrency, args.rate_limit
+        )
+        return
+
     transcription.process_audio_files(input_folder, output_folder, config)
 
 
@@ -1 +1,8 @@
-from .config_manager import install_config, load_config, archive_files
+from .config_manager import (
+    install_config,
+    load_config,
+    archive_files,
+    restore_file,
+    validate_config,
+    ConfigValidationError,
+)
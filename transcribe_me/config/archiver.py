@@ -0,0 +1,315 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Optional
+
+BLOCK_SIZE = tarfile.BLOCKSIZE
+END_OF_ARCHIVE = b"\0" * (BLOCK_SIZE * 2)
+COMPRESSION_WORKERS = os.cpu_count() or 4
+COMPRESSION_LEVEL = 6
+# Files are streamed through the compressor this many bytes at a time.
+READ_SIZE = 1024 * 1024
+# Compressed frames up to this size are held in memory until they are written
+# to the bundle; larger ones are spooled to a temporary file.
+SPOOL_SIZE = 4 * 1024 * 1024
+
+
+class ArchiveVerificationError(Exception):
+    """Raised when a bundle does not match its manifest."""
+
+
+def _import_zstandard():
+    """Import the optional zstandard module, returning None if it is not installed."""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+class _Codec:
+    """Compress and decompress independent frames with zstd, falling back to gzip."""
+
+    def __init__(self, name: Optional[str] = None):
+        zstandard = _import_zstandard()
+        if name is None:
+            name = "zstd" if zstandard else "gzip"
+        if name == "zstd" and zstandard is None:
+            raise ImportError(
+                "The 'zstandard' package is required to read this bundle. "
+                "Please install it with: pip install zstandard"
+            )
+        self.name = name
+        self.extension = ".tar.zst" if name == "zstd" else ".tar.gz"
+        self._zstandard = zstandard
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=COMPRESSION_LEVEL)
+
+    def writer(self, target: IO[bytes]) -> IO[bytes]:
+        """Open a stream that compresses into one frame of `target`, finished when the stream is closed."""
+        if self.name == "zstd":
+            return self._zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).stream_writer(target, closefd=False)
+        return gzip.GzipFile(fileobj=target, mode="wb", compresslevel=COMPRESSION_LEVEL)
+
+    def reader(self, source: IO[bytes]) -> IO[bytes]:
+        """Open a stream that decompresses the frame read from `source`."""
+        if self.name == "zstd":
+            return self._zstandard.ZstdDecompressor().stream_reader(source, closefd=False)
+        return gzip.GzipFile(fileobj=source, mode="rb")
+
+
+class _Frame(io.RawIOBase):
+    """Read-only view of one compressed frame inside a bundle."""
+
+    def __init__(self, bundle: IO[bytes], offset: int, length: int):
+        bundle.seek(offset)
+        self._bundle = bundle
+        self._left = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._bundle.read(min(len(buffer), self._left))
+        buffer[: len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+
+def _compress_member(codec: _Codec, path: str, arcname: str, target: IO[bytes]) -> tuple[int, str]:
+    """
+    Stream one file into `target` as a compressed tar member, hashing it on the way.
+
+    Returns:
+        tuple: The file size and its SHA-256.
+    """
+    stat = os.stat(path)
+    info = tarfile.TarInfo(arcname)
+    info.size = stat.st_size
+    info.mtime = int(stat.st_mtime)
+    info.mode = stat.st_mode & 0o777
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as file, codec.writer(target) as stream:
+        stream.write(info.tobuf(tarfile.PAX_FORMAT))
+        for block in iter(lambda: file.read(min(READ_SIZE, info.size - size)), b""):
+            digest.update(block)
+            stream.write(block)
+            size += len(block)
+        if size != info.size:
+            raise ArchiveVerificationError(f"{path} changed size while it was being archived")
+        stream.write(b"\0" * ((BLOCK_SIZE - size % BLOCK_SIZE) % BLOCK_SIZE))
+    return size, digest.hexdigest()
+
+
+def manifest_path(bundle_path: str) -> str:
+    """Return the path of the manifest that belongs to a bundle."""
+    for extension in (".tar.zst", ".tar.gz"):
+        if bundle_path.endswith(extension):
+            return bundle_path[: -len(extension)] + ".manifest.json"
+    return bundle_path + ".manifest.json"
+
+
+def write_bundle(sources: list[tuple[str, str]], bundle_base: str) -> tuple[str, dict]:
+    """
+    Stream files into one compressed tar bundle and write its manifest.
+
+    Every tar member is streamed through the compressor as an independent
+    frame, in parallel, and the frames are concatenated, so no file is ever
+    held in memory whole. The result is still a valid compressed tar
+    that standard tools can extract, while the manifest records each member's
+    frame offset so a single file can be restored without reading the rest.
+
+    Args:
+        sources (list[tuple[str, str]]): Pairs of (file path, name inside the bundle).
+        bundle_base (str): Bundle path without extension.
+
+    Returns:
+        tuple[str, dict]: The bundle path and its manifest.
+    """
+    codec = _Codec()
+    bundle_path = bundle_base + codec.extension
+    manifest = {"codec": codec.name, "files": []}
+
+    def compress(source: tuple[str, str]) -> tuple[IO[bytes], int, str]:
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            size, digest = _compress_member(codec, *source, spool)
+        except BaseException:
+            spool.close()
+            raise
+        return spool, size, digest
+
+    offset = 0
+    with open(bundle_path, "wb") as bundle, ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS) as executor:
+        window = COMPRESSION_WORKERS * 2
+        for start in range(0, len(sources), window):
+            batch = sources[start: start + window]
+            for (_, arcname), (spool, size, digest) in zip(batch, executor.map(compress, batch)):
+                with spool:
+                    length = spool.tell()
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, bundle, READ_SIZE)
+                manifest["files"].append(
+                    {"name": arcname, "size": size, "sha256": digest, "offset": offset, "length": length}
+                )
+                offset += length
+        bundle.write(codec.compress(END_OF_ARCHIVE))
+
+    with open(manifest_path(bundle_path), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return bundle_path, manifest
+
+
+def _copy_member(bundle: IO[bytes], codec: _Codec, entry: dict, target: Optional[IO[bytes]] = None) -> tuple[int, str]:
+    """
+    Stream one member out of its frame, hashing it and optionally copying it to `target`.
+
+    Returns:
+        tuple: The member's size and its SHA-256.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with codec.reader(_Frame(bundle, entry["offset"], entry["length"])) as stream, \
+            tarfile.open(fileobj=stream, mode="r|") as tar:
+        data = tar.extractfile(tar.next())
+        for block in iter(lambda: data.read(READ_SIZE), b""):
+            digest.update(block)
+            size += len(block)
+            if target is not None:
+                target.write(block)
+    return size, digest.hexdigest()
+
+
+def verify_bundle(bundle_path: str, manifest: dict) -> None:
+    """
+    Check every member of a bundle against the sizes and hashes in its manifest.
+
+    Raises:
+        ArchiveVerificationError: If a member is missing or does not match.
+    """
+    codec = _Codec(manifest["codec"])
+    with open(bundle_path, "rb") as bundle:
+        for entry in manifest["files"]:
+            try:
+                size, digest = _copy_member(bundle, codec, entry)
+            except Exception as e:
+                raise ArchiveVerificationError(f"Could not read {entry['name']} from {bundle_path}: {e}")
+            if size != entry["size"] or digest != entry["sha256"]:
+                raise ArchiveVerificationError(f"{entry['name']} in {bundle_path} does not match the manifest")
+
+
+def restore_member(bundle_path: str, name: str, destination: str) -> str:
+    """
+    Restore one file from a bundle using its manifest, without extracting the rest.
+
+    Args:
+        bundle_path (str): Path to the bundle.
+        name (str): Name of the file inside the bundle, e.g. "output/meeting.txt".
+        destination (str): Folder to restore the file into.
+
+    Returns:
+        str: Path of the restored file.
+    """
+    with open(manifest_path(bundle_path), "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    entry = next((entry for entry in manifest["files"] if entry["name"] == name), None)
+    if entry is None:
+        raise FileNotFoundError(f"{name} is not in {bundle_path}")
+
+    os.makedirs(destination, exist_ok=True)
+    restored = os.path.join(destination, os.path.basename(name))
+    with open(bundle_path, "rb") as bundle, open(restored, "wb") as file:
+        _, digest = _copy_member(bundle, _Codec(manifest["codec"]), entry, file)
+    if digest != entry["sha256"]:
+        os.remove(restored)
+        raise ArchiveVerificationError(f"{name} in {bundle_path} does not match the manifest")
+    return restored
+
+
+def _same_filesystem(path: str, folder: str) -> bool:
+    try:
+        return os.stat(path).st_dev == os.stat(folder).st_dev
+    except OSError:
+        return False
+
+
+def _expand(path: str, arcname: str) -> list[tuple[str, str]]:
+    """List the files under `path`, which may be a single file or a folder."""
+    if not os.path.isdir(path):
+        return [(path, arcname)]
+    files = []
+    for root, _, names in os.walk(path):
+        for name in sorted(names):
+            full_path = os.path.join(root, name)
+            files.append((full_path, os.path.join(arcname, os.path.relpath(full_path, path))))
+    return files
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def archive(sources: list[tuple[str, str]], archive_folder: str, name: str, bundle: bool = False) -> dict:
+    """
+    Archive files, renaming them when they are on the same filesystem and bundling the rest.
+
+    Bundled sources are only deleted once the bundle has been verified against
+    its manifest, and nothing is renamed until then either.
+
+    Args:
+        sources (list[tuple[str, str]]): Pairs of (file or folder path, name inside the archive).
+        archive_folder (str): Folder that holds all archives.
+        name (str): Name of this archive, used for the folder and bundle.
+        bundle (bool): Bundle every source, even those that could be renamed.
+
+    Returns:
+        dict: Counts and sizes describing what was archived, and under "moved"
+        each (old path, new location) pair, where a bundled file's location is
+        `<bundle>#<name>`.
+    """
+    os.makedirs(archive_folder, exist_ok=True)
+    renamable, to_bundle = [], []
+    for source in sources:
+        if not bundle and _same_filesystem(source[0], archive_folder):
+            renamable.append(source)
+        else:
+            to_bundle.append(source)
+    summary = {"renamed": 0, "bundled": 0, "bytes": 0, "compressed_bytes": 0, "folder": None, "bundle": None, "moved": []}
+
+    # The bundle is written and verified before anything is renamed, so a failed
+    # verification leaves every source where it was.
+    files = [file for path, arcname in to_bundle for file in _expand(path, arcname)]
+    if files:
+        bundle_path, manifest = write_bundle(files, os.path.join(archive_folder, name))
+        verify_bundle(bundle_path, manifest)
+        for path, _ in to_bundle:
+            _remove(path)
+        summary["bundle"] = bundle_path
+        summary["moved"].extend((path, f"{bundle_path}#{arcname}") for path, arcname in files)
+        summary["bundled"] = len(files)
+        summary["bytes"] = sum(entry["size"] for entry in manifest["files"])
+        summary["compressed_bytes"] = os.path.getsize(bundle_path)
+
+    if renamable:
+        summary["folder"] = os.path.join(archive_folder, name)
+        for path, arcname in renamable:
+            destination = os.path.join(summary["folder"], arcname)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.rename(path, destination)
+            summary["moved"].append((path, destination))
+            summary["renamed"] += 1
+    return summary
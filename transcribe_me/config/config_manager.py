@@ -1,56 +1,88 @@
 import os
-import shutil
 import datetime
 from glob import glob
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import yaml
 import yamale
 from colorama import Fore
 
+from . import archiver
+
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 ASSEMBLYAI_API_KEY = os.environ.get("ASSEMBLYAI_API_KEY")
 
 DEFAULT_OUTPUT_FOLDER = "output"
 DEFAULT_INPUT_FOLDER = "input"
 DEFAULT_CONFIG_FILE = ".transcribe.yaml"
+DEFAULT_STATE_FOLDER = ".transcribe-me"
+DEFAULT_ARCHIVE_FOLDER = "archive"
 
 
-def archive_files(input_folder: str, output_folder: str) -> None:
+def archive_files(input_folder: str, output_folder: str, bundle: bool = False) -> Optional[Dict[str, Any]]:
     """
-    Move input and output files to a timestamped folder inside the archive folder.
+    Move input and output files into a timestamped archive inside the archive folder.
+
+    Files on the same filesystem as the archive folder are renamed into a
+    timestamped folder. Anything else, or everything when `bundle` is set, is
+    written to a single compressed bundle with a manifest of sizes and hashes,
+    and only removed once the bundle has been verified.
 
     Args:
         input_folder (str): Path to the input folder.
         output_folder (str): Path to the output folder.
-    """
-    archive_folder = "archive"
-    if not os.path.exists(archive_folder):
-        os.makedirs(archive_folder)
+        bundle (bool): Always write a compressed bundle instead of renaming.
 
+    Returns:
+        Optional[Dict[str, Any]]: The archive summary from `archiver.archive`, or None if there was nothing to archive.
+    """
+    archive_folder = DEFAULT_ARCHIVE_FOLDER
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    timestamped_folder = os.path.join(archive_folder, timestamp)
-    os.makedirs(timestamped_folder)
-
-    input_dest = os.path.join(timestamped_folder, "input")
-    output_dest = os.path.join(timestamped_folder, "output")
-    os.makedirs(input_dest, exist_ok=True)
-    os.makedirs(output_dest, exist_ok=True)
-
-    for file_path in glob(os.path.join(input_folder, "*")):
-        file_name = os.path.basename(file_path)
-        dest_path = os.path.join(input_dest, file_name)
-        shutil.move(file_path, dest_path)
-        print(f"{Fore.GREEN}Moved {file_path} to {dest_path}")
-
-    for file_path in glob(os.path.join(output_folder, "*")):
-        file_name = os.path.basename(file_path)
-        dest_path = os.path.join(output_dest, file_name)
-        shutil.move(file_path, dest_path)
-        print(f"{Fore.GREEN}Moved {file_path} to {dest_path}")
 
-    print(
-        f"{Fore.GREEN}All input and output files have been moved to {timestamped_folder}"
-    )
+    sources = [
+        (file_path, os.path.join(kind, os.path.basename(file_path)))
+        for kind, folder in (("input", input_folder), ("output", output_folder))
+        for file_path in glob(os.path.join(folder, "*"))
+    ]
+    if not sources:
+        print(f"{Fore.YELLOW}Nothing to archive in {input_folder} or {output_folder}")
+        return None
+
+    try:
+        summary = archiver.archive(sources, archive_folder, timestamp, bundle=bundle)
+    except archiver.ArchiveVerificationError as e:
+        print(f"{Fore.RED}Archive verification failed, no files were removed: {e}")
+        exit(1)
+
+    parts = []
+    if summary["renamed"]:
+        parts.append(f"moved {summary['renamed']} files to {summary['folder']}")
+    if summary["bundled"]:
+        parts.append(
+            f"bundled {summary['bundled']} files "
+            f"({summary['bytes'] / 1e6:.1f} MB -> {summary['compressed_bytes'] / 1e6:.1f} MB) "
+            f"into {summary['bundle']}"
+        )
+    print(f"{Fore.GREEN}Archived: {', '.join(parts)}")
+    return summary
+
+
+def restore_file(bundle_path: str, member: str, input_folder: str, output_folder: str) -> None:
+    """
+    Restore a single file from an archive bundle into the input or output folder.
+
+    Args:
+        bundle_path (str): Path to the bundle.
+        member (str): Name of the file inside the bundle, e.g. "output/meeting.txt".
+        input_folder (str): Folder to restore archived input files into.
+        output_folder (str): Folder to restore archived output files into.
+    """
+    destination = input_folder if member.startswith("input/") else output_folder
+    try:
+        restored = archiver.restore_member(bundle_path, member, destination)
+    except (FileNotFoundError, archiver.ArchiveVerificationError) as e:
+        print(f"{Fore.RED}Could not restore {member}: {e}")
+        exit(1)
+    print(f"{Fore.GREEN}Restored {member} to {restored}")
 
 
 def install_config() -> None:
@@ -145,6 +177,35 @@ def append_to_shell_profile(line):
         print(f"{Fore.YELLOW}{line}")
 
 
+class ConfigValidationError(ValueError):
+    """Raised when a configuration does not match the schema."""
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__("Config validation failed: " + "; ".join(errors))
+
+
+def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a configuration dictionary against the schema without printing or exiting.
+
+    Args:
+        config (Dict[str, Any]): The configuration to validate.
+
+    Returns:
+        dict: The same configuration.
+
+    Raises:
+        ConfigValidationError: If the configuration does not match the schema.
+    """
+    schema = yamale.make_schema(os.path.join(os.path.dirname(__file__), "schema.yaml"))
+    try:
+        yamale.validate(schema, [(config, None)])
+    except yamale.YamaleError as e:
+        raise ConfigValidationError([error for result in e.results for error in result.errors])
+    return config
+
+
 def load_config() -> Dict[str, Any]:
     """
     Load the configuration from the default config file.
@@ -0,0 +1,334 @@
+"""
+Full-text search over output transcripts for `transcribe-me search`.
+
+Transcripts are indexed into a SQLite FTS5 table as they are written. Where
+the provider returned chunk or segment timestamps, they are saved next to the
+transcript in `<transcript>.segments.json` and each segment is indexed as its
+own passage, so hits point at a position in the recording. The index only
+holds derived data: it is kept in step with `archive` moves, and can be
+rebuilt from the transcripts on disk whenever it is lost.
+"""
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+
+from colorama import Fore
+
+from .config.config_manager import DEFAULT_STATE_FOLDER
+
+DEFAULT_INDEX_PATH = os.path.join(DEFAULT_STATE_FOLDER, "search.db")
+BUNDLE_SEPARATOR = "#"
+
+Passage = tuple[Optional[float], Optional[float], str]
+
+
+@dataclass
+class SearchHit:
+    """A passage that matched a query, best first."""
+
+    path: str
+    start_ms: Optional[float]
+    end_ms: Optional[float]
+    snippet: str
+    score: float
+
+
+def segments_path(transcript_path: str) -> str:
+    """Return the path of the segment timestamps that belong to a transcript."""
+    return f"{os.path.splitext(transcript_path)[0]}.segments.json"
+
+
+def write_segments(transcript_path: str, passages: list[Passage]) -> None:
+    """Save (start_ms, end_ms, text) passages next to a transcript."""
+    with open(segments_path(transcript_path), "w", encoding="utf-8") as file:
+        json.dump([list(passage) for passage in passages], file)
+
+
+def read_transcript(transcript_path: str) -> tuple[str, list[Passage]]:
+    """
+    Read a transcript and its passages.
+
+    Returns:
+        tuple[str, list[Passage]]: The text, and its timestamped passages if
+        saved, otherwise the whole text as one passage without timestamps.
+    """
+    with open(transcript_path, "r", encoding="utf-8") as file:
+        text = file.read()
+    try:
+        with open(segments_path(transcript_path), "r", encoding="utf-8") as file:
+            passages = [tuple(passage) for passage in json.load(file)]
+    except (OSError, ValueError):
+        passages = [(None, None, text)]
+    return text, passages
+
+
+def _location_exists(location: str) -> bool:
+    return os.path.exists(location.split(BUNDLE_SEPARATOR, 1)[0])
+
+
+def _fts_query(query: str) -> str:
+    """Quote every term so punctuation in a query is never read as FTS5 syntax."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+class TranscriptIndex:
+    """
+    SQLite FTS5 index of transcript passages.
+
+    Passage text lives in an FTS5 table whose rowids match a plain table of
+    passage metadata, so a transcript's passages can be replaced through an
+    ordinary index on its document id.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passage_meta (
+                id INTEGER PRIMARY KEY,
+                document_id INTEGER NOT NULL,
+                start_ms REAL,
+                end_ms REAL
+            );
+            CREATE INDEX IF NOT EXISTS passages_by_document ON passage_meta (document_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(text, tokenize = 'porter unicode61');
+            """
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def _delete(self, document_id: int) -> None:
+        self.connection.execute(
+            "DELETE FROM passages WHERE rowid IN (SELECT id FROM passage_meta WHERE document_id = ?)",
+            (document_id,),
+        )
+        self.connection.execute("DELETE FROM passage_meta WHERE document_id = ?", (document_id,))
+        self.connection.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def add(self, transcript_path: str, passages: Optional[list[Passage]] = None) -> None:
+        """
+        Index a transcript, replacing any previous entry for the same path.
+
+        Args:
+            transcript_path (str): Path to the transcript.
+            passages (Optional[list[Passage]]): Its passages, read from disk if not given.
+        """
+        if passages is None:
+            _, passages = read_transcript(transcript_path)
+        path = os.path.abspath(transcript_path)
+        stat = os.stat(transcript_path)
+        with self.connection:
+            row = self.connection.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+            if row:
+                self._delete(row[0])
+            document_id = self.connection.execute(
+                "INSERT INTO documents (path, mtime, size) VALUES (?, ?, ?)",
+                (path, stat.st_mtime, stat.st_size),
+            ).lastrowid
+            for start_ms, end_ms, text in passages:
+                passage_id = self.connection.execute(
+                    "INSERT INTO passage_meta (document_id, start_ms, end_ms) VALUES (?, ?, ?)",
+                    (document_id, start_ms, end_ms),
+                ).lastrowid
+                self.connection.execute("INSERT INTO passages (rowid, text) VALUES (?, ?)", (passage_id, text))
+
+    def is_current(self, transcript_path: str) -> bool:
+        """Return True if a transcript is indexed and unchanged since."""
+        row = self.connection.execute(
+            "SELECT mtime, size FROM documents WHERE path = ?", (os.path.abspath(transcript_path),)
+        ).fetchone()
+        if row is None:
+            return False
+        stat = os.stat(transcript_path)
+        return row == (stat.st_mtime, stat.st_size)
+
+    def relocate(self, moves: list[tuple[str, str]]) -> int:
+        """
+        Point entries at the new location of moved transcripts.
+
+        Moving a folder relocates every transcript inside it. A location may
+        also name a file inside an archive bundle as `<bundle>#<member>`.
+
+        Args:
+            moves (list[tuple[str, str]]): Pairs of (old path, new location).
+
+        Returns:
+            int: Number of entries updated.
+        """
+        updated = 0
+        with self.connection:
+            for old, new in moves:
+                old = os.path.abspath(old)
+                new = new if BUNDLE_SEPARATOR in new else os.path.abspath(new)
+                # The range matches everything under `old` as a folder while still using the path index.
+                updated += self.connection.execute(
+                    "UPDATE documents SET path = ? || substr(path, ?) WHERE path = ? OR (path > ? AND path < ?)",
+                    (new, len(old) + 1, old, old + os.sep, old + chr(ord(os.sep) + 1)),
+                ).rowcount
+        return updated
+
+    def prune(self) -> int:
+        """Drop entries whose transcript no longer exists. Returns the number removed."""
+        rows = self.connection.execute("SELECT id, path FROM documents").fetchall()
+        missing = [document_id for document_id, path in rows if not _location_exists(path)]
+        with self.connection:
+            for document_id in missing:
+                self._delete(document_id)
+        return len(missing)
+
+    def search(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """
+        Find the passages that best match a query, ranked by BM25.
+
+        Every word in the query must appear in a passage for it to match.
+
+        Args:
+            query (str): Words to search for.
+            limit (int): Most hits to return.
+
+        Returns:
+            list[SearchHit]: The hits, best first.
+        """
+        if not query.split():
+            return []
+        rows = self.connection.execute(
+            """
+            SELECT documents.path, passage_meta.start_ms, passage_meta.end_ms,
+                   snippet(passages, 0, '[', ']', '...', 16), bm25(passages)
+            FROM passages
+            JOIN passage_meta ON passage_meta.id = passages.rowid
+            JOIN documents ON documents.id = passage_meta.document_id
+            WHERE passages MATCH ?
+            ORDER BY bm25(passages)
+            LIMIT ?
+            """,
+            (_fts_query(query), limit),
+        )
+        return [SearchHit(path, start_ms, end_ms, snippet, -score) for path, start_ms, end_ms, snippet, score in rows]
+
+
+def index_transcript(
+    transcript_path: str, passages: Optional[list[Passage]] = None, index_path: str = DEFAULT_INDEX_PATH
+) -> None:
+    """Add or refresh a single transcript in the index, once it has been written."""
+    os.stat(transcript_path)
+    index = TranscriptIndex(index_path)
+    try:
+        index.add(transcript_path, passages)
+    finally:
+        index.close()
+
+
+def relocate_transcripts(moves: list[tuple[str, str]], index_path: str = DEFAULT_INDEX_PATH) -> int:
+    """Update the index after transcripts were moved. Returns the number of entries updated."""
+    if not os.path.exists(index_path):
+        return 0
+    index = TranscriptIndex(index_path)
+    try:
+        return index.relocate(moves)
+    finally:
+        index.close()
+
+
+def rebuild_index(folders: list[str], index_path: str = DEFAULT_INDEX_PATH) -> int:
+    """
+    Bring the index up to date with the transcripts under some folders.
+
+    New and changed transcripts are indexed, unchanged ones are skipped, and
+    entries for transcripts that no longer exist are dropped.
+
+    Args:
+        folders (list[str]): Folders to search for `.txt` transcripts, recursively.
+        index_path (str): Path to the index.
+
+    Returns:
+        int: Number of transcripts indexed.
+    """
+    index = TranscriptIndex(index_path)
+    indexed = 0
+    try:
+        index.prune()
+        for folder in folders:
+            for root, _, names in os.walk(folder):
+                for name in sorted(names):
+                    path = os.path.join(root, name)
+                    if name.endswith(".txt") and not index.is_current(path):
+                        index.add(path)
+                        indexed += 1
+    finally:
+        index.close()
+    return indexed
+
+
+def search_transcripts(query: str, limit: int = 20, index_path: str = DEFAULT_INDEX_PATH) -> list[SearchHit]:
+    """Search the index for a query. See `TranscriptIndex.search`."""
+    index = TranscriptIndex(index_path)
+    try:
+        return index.search(query, limit)
+    finally:
+        index.close()
+
+
+def format_timestamp(milliseconds: Optional[float]) -> str:
+    """Format a position in a recording as H:MM:SS, or an empty string if unknown."""
+    if milliseconds is None:
+        return ""
+    minutes, seconds = divmod(int(milliseconds // 1000), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def search_folder(
+    query: str,
+    output_folder: str,
+    archive_folder: str,
+    limit: int = 20,
+    rebuild: bool = False,
+    index_path: str = DEFAULT_INDEX_PATH,
+) -> list[SearchHit]:
+    """
+    Search the transcripts and print the hits, rebuilding the index first if it is missing.
+
+    Args:
+        query (str): Words to search for.
+        output_folder (str): Folder the transcripts are written to.
+        archive_folder (str): Folder that archived transcripts are moved into.
+        limit (int): Most hits to return.
+        rebuild (bool): Refresh the index from both folders even if it exists.
+        index_path (str): Path to the index.
+
+    Returns:
+        list[SearchHit]: The hits, best first.
+    """
+    if rebuild or not os.path.exists(index_path):
+        indexed = rebuild_index([output_folder, archive_folder], index_path)
+        print(f"{Fore.BLUE}Indexed {indexed} transcripts from {output_folder} and {archive_folder}")
+    if not query:
+        return []
+
+    hits = search_transcripts(query, limit, index_path)
+    if not hits:
+        print(f"{Fore.YELLOW}No transcripts match {query!r}")
+    for hit in hits:
+        timestamp = format_timestamp(hit.start_ms)
+        location = f"{hit.path} @ {timestamp}" if timestamp else hit.path
+        print(f"{Fore.GREEN}{location}")
+        print(f"  {' '.join(hit.snippet.split())}")
+    return hits
@@ -0,0 +1,383 @@
+"""
+Local HTTP job service for `transcribe-me serve`.
+
+Audio is submitted as an upload or a local path and placed in a bounded queue
+that a fixed pool of workers drains through the async library API. Workers
+stay up between jobs so provider clients and event loops are reused.
+
+Endpoints:
+    POST /jobs                 Submit raw audio bytes, or JSON {"path": "..."}.
+    GET  /jobs/<id>            Job status.
+    GET  /jobs/<id>/result     Full transcript once the job is done.
+    GET  /jobs/<id>/stream     Chunk transcripts as newline-delimited JSON while they arrive.
+    GET  /health               Liveness.
+    GET  /metrics              Queue, worker and latency counters.
+"""
+import asyncio
+import dataclasses
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from colorama import Fore
+
+from .api import ChunkResult, TranscriptionOptions, transcribe_stream
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 100
+MAX_UPLOAD_BYTES = 500 * 1024 * 1024
+MAX_FINISHED_JOBS = 1000
+STREAM_POLL_SECONDS = 15
+
+
+@dataclasses.dataclass
+class Job:
+    """A submitted transcription and its progress."""
+
+    id: str
+    source: str
+    uploaded: bool
+    status: str = "queued"
+    chunks: list[ChunkResult] = dataclasses.field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = dataclasses.field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    changed: threading.Condition = dataclasses.field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    @property
+    def text(self) -> str:
+        return " ".join(chunk.text for chunk in self.chunks if chunk.text)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "chunks": len(self.chunks),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _chunk_json(chunk: ChunkResult) -> Dict[str, Any]:
+    return {"index": chunk.index, "start_ms": chunk.start_ms, "end_ms": chunk.end_ms, "text": chunk.text}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class TranscriptionService:
+    """
+    Bounded job queue drained by a fixed pool of long-lived worker threads.
+
+    Each worker owns an event loop for its whole lifetime and runs jobs through
+    `transcribe_stream`, publishing chunks to the job as they arrive.
+    """
+
+    def __init__(self, options: TranscriptionOptions, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.options = options
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=queue_size)
+        self.spool = tempfile.mkdtemp(prefix="transcribe-me-serve-")
+        self.metrics = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "running": 0}
+        self.latencies: list[float] = []
+        self._lock = threading.Lock()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        """Drop queued jobs and let each worker exit once its current job is done."""
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None and job.uploaded and os.path.exists(job.source):
+                os.remove(job.source)
+        for _ in self.workers:
+            self.queue.put(None)
+
+    def submit(self, source: str, uploaded: bool = False) -> Job:
+        """
+        Queue a file for transcription.
+
+        Raises:
+            QueueFullError: If the queue is at capacity.
+        """
+        job = Job(id=uuid.uuid4().hex, source=source, uploaded=uploaded)
+        with self._lock:
+            self.jobs[job.id] = job
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self.jobs[job.id]
+                self.metrics["rejected"] += 1
+            raise QueueFullError("The job queue is full, try again later")
+
+        with self._lock:
+            self.metrics["submitted"] += 1
+            self._evict()
+        return job
+
+    def submit_upload(self, data: bytes, suffix: str = "") -> Job:
+        """Spool uploaded audio to disk and queue it, removing it once transcribed."""
+        handle, path = tempfile.mkstemp(dir=self.spool, suffix=suffix)
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        try:
+            return self.submit(path, uploaded=True)
+        except QueueFullError:
+            os.remove(path)
+            raise
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            metrics = dict(self.metrics)
+        metrics["queued"] = self.queue.qsize()
+        metrics["queue_capacity"] = self.queue.maxsize
+        metrics["workers"] = len(self.workers)
+        if latencies:
+            metrics["latency_p50_seconds"] = latencies[len(latencies) // 2]
+            metrics["latency_p95_seconds"] = latencies[int(len(latencies) * 0.95)]
+        return metrics
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job_id]
+
+    def _work(self) -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                job = self.queue.get()
+                if job is None:
+                    return
+                loop.run_until_complete(self._run(job))
+        finally:
+            loop.close()
+
+    async def _run(self, job: Job) -> None:
+        with job.changed:
+            job.status = "running"
+            job.started_at = time.time()
+        with self._lock:
+            self.metrics["running"] += 1
+
+        try:
+            async for chunk in transcribe_stream(job.source, self.options):
+                with job.changed:
+                    job.chunks.append(chunk)
+                    job.changed.notify_all()
+            status, error = "done", None
+        except Exception as e:
+            status, error = "failed", str(e) or type(e).__name__
+        finally:
+            if job.uploaded and os.path.exists(job.source):
+                os.remove(job.source)
+
+        with job.changed:
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+            job.changed.notify_all()
+        with self._lock:
+            self.metrics["running"] -= 1
+            self.metrics["completed" if status == "done" else "failed"] += 1
+            self.latencies = (self.latencies + [job.finished_at - job.created_at])[-1000:]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP routes for a `TranscriptionService`, bound to one by `make_handler`."""
+
+    protocol_version = "HTTP/1.1"
+    service: TranscriptionService
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"No job with id {job_id}"})
+        return job
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        body = self._read_body()
+        if body is None:
+            return
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                job = self._submit_path(body)
+            else:
+                job = self._submit_upload(body)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "Invalid JSON"})
+            return
+        if job:
+            self._send_json(202, job.describe())
+
+    def _read_body(self) -> Optional[bytes]:
+        # A body that is not read would be parsed as the next request on a
+        # keep-alive connection, so the connection is closed after rejecting it.
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return None
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": f"Uploads are limited to {MAX_UPLOAD_BYTES} bytes"})
+            return None
+        return self.rfile.read(length)
+
+    def _submit_path(self, body: bytes) -> Optional[Job]:
+        path = json.loads(body or b"{}").get("path")
+        if not path or not os.path.isfile(path):
+            self._send_json(400, {"error": "Expected JSON with the path of an existing file"})
+            return None
+        return self.service.submit(path)
+
+    def _submit_upload(self, body: bytes) -> Optional[Job]:
+        if not body:
+            self._send_json(400, {"error": "Expected audio in the request body"})
+            return None
+        suffix = os.path.splitext(self.headers.get("X-Filename", ""))[1]
+        return self.service.submit_upload(body, suffix)
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok"})
+        elif parts == ["metrics"]:
+            self._send_json(200, self.service.snapshot())
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            self._send_job_view(parts[1], parts[2] if len(parts) == 3 else "")
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _send_job_view(self, job_id: str, view: str) -> None:
+        views = {"": self._send_status, "result": self._send_result, "stream": self._stream}
+        if view not in views:
+            self._send_json(404, {"error": "Not found"})
+            return
+        job = self._job(job_id)
+        if job:
+            views[view](job)
+
+    def _send_status(self, job: Job) -> None:
+        self._send_json(200, job.describe())
+
+    def _send_result(self, job: Job) -> None:
+        if job.status == "failed":
+            self._send_json(500, job.describe())
+        elif job.status != "done":
+            self._send_json(202, job.describe())
+        else:
+            self._send_json(200, {**job.describe(), "text": job.text, "segments": [_chunk_json(c) for c in job.chunks]})
+
+    def _write_chunk(self, data: Dict[str, Any]) -> None:
+        line = json.dumps(data).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, job: Job) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        sent = 0
+        while True:
+            with job.changed:
+                job.changed.wait_for(lambda: len(job.chunks) > sent or job.finished, timeout=STREAM_POLL_SECONDS)
+                chunks = job.chunks[sent:]
+                finished = job.finished
+            for chunk in chunks:
+                self._write_chunk(_chunk_json(chunk))
+            sent += len(chunks)
+            if finished:
+                self._write_chunk(job.describe())
+                break
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def make_handler(service: TranscriptionService) -> type:
+    """Build a request handler class bound to `service`."""
+    return type("Handler", (_Handler,), {"service": service})
+
+
+def serve(
+    options: TranscriptionOptions,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> None:
+    """
+    Run the job service until interrupted.
+
+    Args:
+        options (TranscriptionOptions): Settings used for every job.
+        host (str): Interface to listen on.
+        port (int): Port to listen on.
+        workers (int): Number of jobs transcribed at the same time.
+        queue_size (int): Jobs that may wait before new submissions are rejected.
+    """
+    service = TranscriptionService(options, workers=workers, queue_size=queue_size)
+    service.start()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"{Fore.GREEN}Serving on http://{host}:{server.server_port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()